@@ -0,0 +1,117 @@
+from fastapi import APIRouter, Header, HTTPException
+from typing import Any, Dict, Optional
+import os
+import threading
+import time
+from bible_loader import bible_loader
+from caches import CACHES
+from game_routes import ia_breaker
+from introspection import estimate_size, process_rss
+from prefetch import prefetch_buffer, warm_pool
+from warming import dernier_prechauffage
+
+# Jeton requis dans l'en-tête X-Admin-Token (routes désactivées s'il n'est pas défini)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+router = APIRouter(prefix="/admin")
+
+def verifier_admin(token: Optional[str]):
+    """Vérifie le jeton d'administration."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Routes d'administration désactivées (ADMIN_TOKEN absent).")
+    if token != ADMIN_TOKEN:
+        raise HTTPException(status_code=401, detail="Jeton d'administration invalide.")
+
+@router.post("/reload")
+def recharger_bible(x_admin_token: Optional[str] = Header(None)):
+    """Recharge les fichiers Bible sans redémarrage ; les requêtes en cours gardent l'ancien snapshot."""
+    verifier_admin(x_admin_token)
+
+    start = time.perf_counter()
+    try:
+        snapshot = bible_loader.reload()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rechargement échoué, données actuelles conservées: {e}")
+
+    return {
+        "status": "ok",
+        "version": snapshot.version,
+        "versets": {lang: len(verses) for lang, verses in snapshot.bibles.items()},
+        "duree_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+# Estimations mémoire du dernier snapshot mesuré : le parcours des structures prend
+# plusieurs secondes sur une Bible complète, il n'est refait qu'après un rechargement
+# ou la construction d'un nouvel index
+_tailles_lock = threading.Lock()
+_tailles: Dict[str, Any] = {}
+
+def estimer_memoire(snapshot) -> Dict[str, Any]:
+    """Mémoire estimée par langue et commune, mise en cache par version du snapshot."""
+    indexes = snapshot.built_indexes()
+    cle = (snapshot.version, tuple(indexes))
+    with _tailles_lock:
+        if _tailles.get("cle") == cle:
+            return _tailles
+
+        # Ensemble partagé : un objet référencé par plusieurs structures n'est compté qu'une fois
+        seen = {id(snapshot)}
+        langues = {}
+        for lang, verses in snapshot.bibles.items():
+            memoire = {
+                "versets": estimate_size(verses, seen),
+                "alignement": estimate_size(snapshot.aligned.get(lang), seen),
+                "fragments": estimate_size(snapshot.fragments.get(lang), seen),
+                "chapitres": estimate_size(snapshot.chapter_payloads.get(lang), seen),
+            }
+            for (name, index_lang), index in sorted(indexes.items()):
+                if index_lang == lang:
+                    memoire[f"index:{name}"] = estimate_size(index, seen)
+            langues[lang] = memoire
+
+        commun = {
+            "verse_ids": estimate_size(snapshot.verse_ids, seen),
+            "livres": estimate_size(snapshot.book_numbers, seen) + estimate_size(snapshot.book_names, seen),
+            "chapitres": estimate_size(snapshot.chapter_spans, seen) + estimate_size(snapshot.chapter_by_span, seen),
+        }
+        _tailles.clear()
+        _tailles.update({"cle": cle, "langues": langues, "commun": commun})
+        return _tailles
+
+@router.get("/stats")
+def statistiques(x_admin_token: Optional[str] = Header(None)):
+    """
+    Volumes par langue, mémoire estimée des données et de chaque index, caches,
+    durées de chargement / construction et mémoire résidente du processus.
+    """
+    verifier_admin(x_admin_token)
+
+    start = time.perf_counter()
+    snapshot = bible_loader.snapshot
+    tailles = estimer_memoire(snapshot)
+
+    langues = {}
+    for lang, verses in snapshot.bibles.items():
+        memoire = tailles["langues"][lang]
+        langues[lang] = {
+            "fichier": bible_loader.files.get(lang),
+            "versets": len(verses),
+            "livres": len(snapshot.book_names.get(lang, [])),
+            "memoire_octets": memoire,
+            "memoire_totale_octets": sum(memoire.values())
+        }
+
+    return {
+        "version": snapshot.version,
+        "charge_depuis_s": round(time.time() - snapshot.loaded_at, 1),
+        "langues": langues,
+        "memoire_commune_octets": tailles["commun"],
+        "durees_ms": {etape: round(d * 1000, 1) for etape, d in snapshot.timings.items()},
+        "caches": {cache.name: cache.stats() for cache in CACHES},
+        "prefetch": prefetch_buffer.stats(),
+        "reserve_questions": warm_pool.stats(),
+        "prechauffage": dernier_prechauffage,
+        "disjoncteur_ia": {"etat": ia_breaker.state, "echecs": ia_breaker.failures},
+        "rss_octets": process_rss(),
+        "duree_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RouteLimit:
+    """
+    Limite de concurrence d'une route : `max_concurrent` requêtes en cours,
+    au plus `max_queue` en attente pendant `max_wait` secondes, sinon 503 immédiat.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int = 0, max_wait: float = 1.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Créé paresseusement dans la boucle asyncio du serveur
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def acquire(self) -> bool:
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await semaphore.acquire()
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._get_semaphore().release()
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI qui applique les RouteLimit par chemin avant d'occuper un thread
+    du pool : les routes coûteuses saturées répondent 503 sans ralentir les autres.
+    """
+
+    def __init__(self, app, limits: Dict[str, RouteLimit], retry_after: int = 2):
+        self.app = app
+        self.limits = limits
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limit.acquire():
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release()
+
+    async def _reject(self, send):
+        body = json.dumps({
+            "error": "Service momentanément surchargé, réessayez dans quelques secondes.",
+            "degrade": True
+        }, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class ReadinessMiddleware:
+    """
+    Middleware ASGI qui retient les requêtes pendant le chargement initial :
+    attente d'au plus `max_wait` secondes que `ready` soit signalé, sinon 503.
+    Les chemins de `exempt` (sondes de santé) passent toujours.
+    """
+
+    def __init__(self, app, ready: threading.Event, exempt=("/health", "/ready"), max_wait: float = 5.0):
+        self.app = app
+        self.ready = ready
+        self.exempt = set(exempt)
+        self.max_wait = max_wait
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and not self.ready.is_set() \
+                and scope.get("path") not in self.exempt:
+            deadline = time.monotonic() + self.max_wait
+            while not self.ready.is_set() and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            if not self.ready.is_set():
+                if scope["type"] == "websocket":
+                    await send({"type": "websocket.close", "code": 1013})
+                    return
+                body = json.dumps({
+                    "error": "Service en cours de démarrage, réessayez dans quelques secondes.",
+                    "status": "loading"
+                }, ensure_ascii=False).encode("utf-8")
+                await send({
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", b"2"),
+                    ],
+                })
+                await send({"type": "http.response.body", "body": body})
+                return
+        await self.app(scope, receive, send)
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur pour un service distant : après `failure_threshold` échecs consécutifs
+    il s'ouvre pendant `reset_timeout` secondes (appels court-circuités), puis laisse
+    passer un appel d'essai qui le referme s'il réussit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Un seul appel d'essai à la fois
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"⚡ Disjoncteur '{self.name}' ouvert après {self.failures} échec(s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
@@ -1,45 +1,64 @@
 import json
+import os
 import requests
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Callable, Iterable, Optional
 from functools import lru_cache
 import re
+from array import array
+from bisect import bisect_left, bisect_right
+from fast_json import dumps
+from compression import precompress
+from canon import CANONICAL_BOOKS, canonical_book_number
 
-class BibleLoader:
-    """Gère le chargement des différentes versions de la Bible via fichiers locaux."""
-    
-    def __init__(self):
-        self.bibles = {}
-        self.load_local_bibles()
+# Fichiers JSON locaux par langue
+BIBLE_FILES = {
+    "fr": "segond_1910.json",
+    "en": "kjv.json",
+}
+
+# Threads de construction des index (1 = construction séquentielle). La compression
+# des chapitres (zlib, brotli) et les calculs NumPy libèrent le GIL.
+BUILD_WORKERS = int(os.environ.get("BIBLE_BUILD_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+def parallel_map(func: Callable, items: Iterable, workers: int = BUILD_WORKERS) -> List[Any]:
+    """Applique func à chaque élément, sur `workers` threads ; résultats dans l'ordre des éléments."""
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix="bible-build") as executor:
+        return list(executor.map(func, items))
+
+# Index dérivés construits pour chaque snapshot : nom -> fonction (snapshot, langue) -> index
+INDEX_BUILDERS: Dict[str, Callable[["BibleSnapshot", str], Any]] = {}
+
+def register_index(name: str, builder: Callable[["BibleSnapshot", str], Any]):
+    """Déclare un index dérivé, construit par langue pour chaque snapshot (et à chaque rechargement)."""
+    INDEX_BUILDERS[name] = builder
+
+class BibleSnapshot:
+    """
+    Données et index issus d'un chargement complet des fichiers.
+    Jamais modifié après construction : un rechargement construit un nouveau
+    snapshot à côté puis le substitue d'un bloc.
+    """
     
-    def load_local_bibles(self):
-        """Charge les fichiers JSON locaux disponibles (FR et EN)."""
-        versions = {
-            "fr": "segond_1910.json",
-            "en": "kjv.json",
-        }
-        
-        for lang, filename in versions.items():
-            try:
-                with open(filename, "r", encoding="utf-8") as f:
-                    raw_data = json.load(f)
-                    
-                    # ✅ Support des deux formats possibles
-                    if "verses" in raw_data:
-                        self.bibles[lang] = raw_data["verses"]
-                    elif isinstance(raw_data, list):
-                        self.bibles[lang] = raw_data
-                    else:
-                        print(f"⚠️  Format non reconnu dans {filename}")
-                        self.bibles[lang] = []
-                    
-                    print(f"✅ {filename} chargé : {len(self.bibles[lang])} versets")
-                    
-            except FileNotFoundError:
-                print(f"⚠️  Le fichier '{filename}' est introuvable.")
-                self.bibles[lang] = []
-            except json.JSONDecodeError as e:
-                print(f"❌ Le fichier {filename} est mal formaté: {e}")
-                self.bibles[lang] = []
+    def __init__(self, bibles: Dict[str, List[Dict[str, Any]]], version: int = 1,
+                 timings: Optional[Dict[str, float]] = None, workers: int = BUILD_WORKERS):
+        self.bibles = bibles
+        self.version = version
+        self.loaded_at = time.time()
+        self.workers = workers
+        # Durées de chargement et de construction par étape (secondes)
+        self.timings: Dict[str, float] = dict(timings or {})
+        self._indexes: Dict[tuple, Any] = {}
+        self._index_lock = threading.Lock()
+        self._index_locks: Dict[tuple, threading.Lock] = {}
+        self._build_indexes()
     
     def get_verses(self, language: str = "fr") -> List[Dict[str, Any]]:
         """
@@ -60,6 +79,148 @@ class BibleLoader:
         """
         return False
     
+    def _build_indexes(self):
+        """
+        Construit l'espace canonique des versets (numéro de livre, chapitre, verset)
+        et, pour chaque traduction, un tableau aligné sur cet espace.
+        
+        - Les livres sont numérotés d'après la table canonique (canon.py), donc "Jean" (fr)
+          et "John" (en) partagent le même numéro même si une traduction omet ou
+          réordonne des livres ; les livres hors canon sont numérotés après, par ordre
+          alphabétique de leur nom normalisé (numéros stables si les fichiers changent d'ordre).
+        - aligned[lang][i] est la position du verset verse_ids[i] dans bibles[lang],
+          ou -1 s'il n'existe pas dans cette traduction.
+        """
+        start = time.perf_counter()
+        book_numbers: Dict[str, int] = {}
+        book_names: Dict[str, Dict[int, str]] = {}
+        entries: Dict[str, List[tuple]] = {}
+        all_ids = set()
+        
+        # Livres hors canon (ex: deutérocanoniques), numérotés après les 66 livres
+        hors_canon = {
+            self._normalize_book(name)
+            for verses in self.bibles.values()
+            for name in {v.get("book_name", "") for v in verses}
+            if canonical_book_number(name) is None
+        }
+        for i, key in enumerate(sorted(hors_canon), start=len(CANONICAL_BOOKS) + 1):
+            book_numbers[key] = i
+        
+        for lang, verses in self.bibles.items():
+            names: Dict[int, str] = {}
+            lang_entries = []
+            previous = None
+            
+            for pos, v in enumerate(verses):
+                name = v.get("book_name", "")
+                if name != previous:
+                    key = self._normalize_book(name)
+                    num = book_numbers.get(key)
+                    if num is None:
+                        num = book_numbers[key] = canonical_book_number(name)
+                    names.setdefault(num, name)
+                    previous = name
+                try:
+                    vid = (num, int(v.get("chapter", 0)), int(v.get("verse", 0)))
+                except (TypeError, ValueError):
+                    continue
+                lang_entries.append((vid, pos))
+                all_ids.add(vid)
+            
+            book_names[lang] = names
+            entries[lang] = lang_entries
+        
+        self.verse_ids = sorted(all_ids)
+        id_index = {vid: i for i, vid in enumerate(self.verse_ids)}
+        
+        self.aligned = {}
+        for lang, lang_entries in entries.items():
+            aligned = array("i", [-1]) * len(self.verse_ids)
+            for vid, pos in lang_entries:
+                aligned[id_index[vid]] = pos
+            self.aligned[lang] = aligned
+        
+        self.book_numbers = book_numbers
+        self.book_names = book_names
+        self.timings["alignement"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self._build_fragments()
+        self.timings["fragments"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self._build_chapter_payloads()
+        self.timings["chapitres"] = time.perf_counter() - start
+    
+    def get_index(self, name: str, language: str = "fr") -> Any:
+        """Retourne l'index dérivé `name` pour une langue, construit au premier besoin."""
+        lang = language if language in self.bibles else "fr"
+        key = (name, lang)
+        index = self._indexes.get(key)
+        if index is None:
+            # Un verrou par index : deux index différents peuvent se construire en même temps
+            with self._index_lock:
+                lock = self._index_locks.setdefault(key, threading.Lock())
+            with lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    start = time.perf_counter()
+                    index = INDEX_BUILDERS[name](self, lang)
+                    self.timings[f"index:{name}:{lang}"] = time.perf_counter() - start
+                    self._indexes[key] = index
+        return index
+    
+    def built_indexes(self) -> Dict[tuple, Any]:
+        """Index dérivés déjà construits : (nom, langue) -> index."""
+        return dict(self._indexes)
+    
+    def build_registered_indexes(self):
+        """
+        Construit tous les index dérivés déclarés, pour toutes les langues, en parallèle
+        (un index par tâche) ; index et durées sont rangés dans l'ordre d'une construction
+        séquentielle.
+        """
+        start = time.perf_counter()
+        keys = [(name, lang) for name in list(INDEX_BUILDERS) for lang in self.bibles]
+        parallel_map(lambda key: self.get_index(*key), keys, self.workers)
+        
+        with self._index_lock:
+            ordered = {key: self._indexes[key] for key in keys}
+            ordered.update((key, index) for key, index in self._indexes.items() if key not in ordered)
+            self._indexes = ordered
+            for name, lang in keys:
+                label = f"index:{name}:{lang}"
+                if label in self.timings:
+                    self.timings[label] = self.timings.pop(label)
+        self.timings["index"] = time.perf_counter() - start
+    
+    def book_number(self, book_name: str) -> Optional[int]:
+        """
+        Numéro canonique d'un livre (quelle que soit la langue de son nom) ; les noms
+        absents des fichiers sont cherchés dans la table canonique (ex: "Esaie", "Isa").
+        """
+        num = self.book_numbers.get(self._normalize_book(book_name))
+        if num is None:
+            num = canonical_book_number(book_name)
+        return num
+    
+    def _build_fragments(self):
+        """
+        Pré-encode en JSON chaque verset tel que /passage le renvoie
+        ({"reference": ..., "text": ...}), aligné sur bibles[lang].
+        """
+        self.fragments = {
+            lang: [
+                dumps({
+                    "reference": f"{v.get('book_name')} {v.get('chapter')}:{v.get('verse')}",
+                    "text": v.get("text", "")
+                })
+                for v in verses
+            ]
+            for lang, verses in self.bibles.items()
+        }
+    
     def get_verses_for_reference(self, reference: str, language: str = "fr") -> List[Dict]:
         """
         Récupère les versets pour une référence donnée.
@@ -67,13 +228,137 @@ class BibleLoader:
         """
         return self._get_from_local_json(reference, language)
     
-    def _get_from_local_json(self, reference: str, language: str = "fr") -> List[Dict]:
+    def _parse_reference(self, reference: str) -> Optional[tuple]:
         """
-        Récupère depuis le JSON local (français ou anglais).
+        Découpe une référence en (livre, [(début, fin), ...]) où début et fin sont
+        des couples (chapitre, verset) ; un verset à None couvre tout le chapitre.
         Gère les différents formats de référence : 
         - "Jean 3:16"
         - "Jean 3:16-18" 
-        - "Jean 3"
+        - "Jean 3" (chapitre entier)
+        - "Jean 3:16-4:3" (plage sur plusieurs chapitres)
+        - "Psaumes 1-3" (plage de chapitres)
+        - "Jean" (livre entier)
+        - "Jean 3:16,18" / "Jean 3:16-18,20-22" / "Psaumes 1,3" (listes)
+        """
+        match = re.match(r"^(\d?\s*[^\d:,\-–]+?)\s*(\d[\d\s:,\-–]*)?$", reference.strip())
+        if not match:
+            return None
+        
+        book, rest = match.groups()
+        if rest is None:
+            # Livre entier
+            return book.strip(), [((None, None), (None, None))]
+        
+        parts = []
+        chapitre_courant = None  # renseigné dès qu'un verset a été cité
+        for item in rest.replace(" ", "").replace("–", "-").split(","):
+            m = re.match(r"^(\d+)(?::(\d+))?(?:-(\d+)(?::(\d+))?)?$", item)
+            if not m:
+                return None
+            a, b, c, d = (int(x) if x is not None else None for x in m.groups())
+            
+            if b is not None:
+                # "C:V", "C:V-V2" ou "C:V-C2:V2"
+                debut = (a, b)
+                if c is None:
+                    fin = (a, b)
+                elif d is None:
+                    fin = (a, c)
+                else:
+                    fin = (c, d)
+                chapitre_courant = fin[0]
+            elif chapitre_courant is not None:
+                # Après un verset, un nombre seul est un verset du chapitre courant ("3:16,18")
+                debut = (chapitre_courant, a)
+                if c is None:
+                    fin = (chapitre_courant, a)
+                elif d is None:
+                    fin = (chapitre_courant, c)
+                else:
+                    fin = (c, d)
+                chapitre_courant = fin[0]
+            else:
+                # "C" ou "C-C2" (chapitres entiers), "C-C2:V2"
+                debut = (a, None)
+                fin = (c if c is not None else a, d)
+            
+            if (debut[0], debut[1] or 0) > (fin[0], fin[1] if fin[1] is not None else float("inf")):
+                return None
+            parts.append((debut, fin))
+        
+        return book.strip(), parts
+    
+    def resolve_reference(self, reference: str) -> Optional[List[range]]:
+        """
+        Traduit une référence (dans n'importe quelle langue chargée) en liste de plages
+        contiguës d'indices de l'espace canonique verse_ids (une par élément de liste).
+        Un livre entier ou plusieurs chapitres restent une seule tranche : le coût ne
+        dépend que de la taille du résultat.
+        Retourne None si la référence n'est pas reconnue.
+        """
+        parsed = self._parse_reference(reference)
+        if parsed is None:
+            return None
+        
+        book, parts = parsed
+        book_num = self.book_number(book)
+        if book_num is None:
+            return []
+        
+        spans = []
+        for (start_c, start_v), (end_c, end_v) in parts:
+            low = (book_num, start_c or 0, start_v or 0)
+            high = (
+                book_num,
+                end_c if end_c is not None else float("inf"),
+                end_v if end_v is not None else float("inf")
+            )
+            span = range(bisect_left(self.verse_ids, low), bisect_right(self.verse_ids, high))
+            if span:
+                spans.append(span)
+        return spans
+    
+    def canonical_reference(self, reference: str, language: str = "fr") -> Optional[str]:
+        """
+        Forme canonique d'une référence ("jean  3:16" -> "Jean 3:16", "Jean 3" -> "Jean 3:1-3:36"),
+        avec le nom du livre dans la langue demandée : deux références qui couvrent les
+        mêmes versets ont la même forme. None si la référence ne couvre aucun verset.
+        """
+        spans = self.resolve_reference(reference)
+        if not spans:
+            return None
+        lang = language if language in self.book_names else "fr"
+        book_num = self.verse_ids[spans[0].start][0]
+        name = self.book_names.get(lang, {}).get(book_num)
+        if name is None:
+            # Livre absent de cette traduction : nom d'une autre langue
+            name = next((names[book_num] for names in self.book_names.values() if book_num in names), None)
+        if name is None:
+            return None
+
+        parts = []
+        for span in spans:
+            _, c1, v1 = self.verse_ids[span.start]
+            _, c2, v2 = self.verse_ids[span.stop - 1]
+            parts.append(f"{c1}:{v1}" if (c1, v1) == (c2, v2) else f"{c1}:{v1}-{c2}:{v2}")
+        return f"{name} {','.join(parts)}"
+
+    def _positions(self, spans: List[range], language: str) -> List[int]:
+        """Positions dans bibles[language] des versets couverts par les plages."""
+        aligned = self.aligned.get(language, self.aligned.get("fr"))
+        if aligned is None:
+            return []
+        return [pos for span in spans for pos in aligned[span.start:span.stop] if pos >= 0]
+    
+    def get_positions(self, reference: str, language: str = "fr") -> List[int]:
+        """Positions dans bibles[language] des versets d'une référence (vide si introuvable)."""
+        spans = self.resolve_reference(reference)
+        return self._positions(spans, language) if spans else []
+    
+    def _get_from_local_json(self, reference: str, language: str = "fr") -> List[Dict]:
+        """
+        Récupère depuis le JSON local (français ou anglais) via l'index canonique.
         """
         verses = self.get_verses(language)
         
@@ -82,79 +367,354 @@ class BibleLoader:
             return []
         
         try:
-            # Pattern 1: Plage de versets (ex: Jean 3:16-18)
-            match_plage = re.match(r"^(.*\D)\s*(\d+):(\d+)-(\d+)$", reference.strip())
+            spans = self.resolve_reference(reference)
             
-            if match_plage:
-                book, chapter, start_v, end_v = match_plage.groups()
-                book = book.strip()
-                chapter = int(chapter)
-                verse_nums = list(range(int(start_v), int(end_v) + 1))
-                
-                found = [
-                    v for v in verses
-                    if self._normalize_book(v.get("book_name", "")) == self._normalize_book(book)
-                    and int(v.get("chapter", 0)) == chapter
-                    and int(v.get("verse", 0)) in verse_nums
-                ]
-                
-                if found:
-                    print(f"✅ Trouvé {len(found)} versets pour '{reference}' en {language}")
-                return found
+            if spans is None:
+                print(f"❌ Format de référence non reconnu: '{reference}'")
+                return []
             
-            # Pattern 2: Verset unique (ex: Jean 3:16)
-            match_unique = re.match(r"^(.*\D)\s*(\d+):(\d+)$", reference.strip())
-            if match_unique:
-                book, chapter, verse = match_unique.groups()
-                book = book.strip()
-                chapter = int(chapter)
-                verse = int(verse)
-                
-                found = [
-                    v for v in verses
-                    if self._normalize_book(v.get("book_name", "")) == self._normalize_book(book)
-                    and int(v.get("chapter", 0)) == chapter
-                    and int(v.get("verse", 0)) == verse
-                ]
-                
-                if found:
-                    print(f"✅ Trouvé verset '{reference}' en {language}")
-                else:
-                    print(f"⚠️  Verset '{reference}' non trouvé en {language}")
-                    print(f"   Livre recherché: '{self._normalize_book(book)}'")
-                
-                return found
-            
-            # Pattern 3: Chapitre entier (ex: Jean 3)
-            match_chapitre = re.match(r"^(.*\D)\s*(\d+)$", reference.strip())
-            if match_chapitre:
-                book, chapter = match_chapitre.groups()
-                book = book.strip()
-                chapter = int(chapter)
-                
-                found = [
-                    v for v in verses
-                    if self._normalize_book(v.get("book_name", "")) == self._normalize_book(book)
-                    and int(v.get("chapter", 0)) == chapter
-                ]
-                
-                if found:
-                    print(f"✅ Trouvé {len(found)} versets pour chapitre '{reference}' en {language}")
-                return found
+            found = [verses[pos] for pos in self._positions(spans, language)]
             
-            print(f"❌ Format de référence non reconnu: '{reference}'")
+            if found:
+                print(f"✅ Trouvé {len(found)} versets pour '{reference}' en {language}")
+            else:
+                print(f"⚠️  Référence '{reference}' non trouvée en {language}")
+            return found
             
         except Exception as e:
             print(f"❌ Erreur parsing référence '{reference}': {e}")
         
         return []
     
+    def _build_chapter_payloads(self):
+        """
+        Pré-calcule, pour chaque chapitre de chaque langue, la réponse JSON de /passage
+        et ses versions compressées (gzip, brotli si disponible).
+        Une tâche par livre et par langue, réparties sur les threads de construction.
+        """
+        self.chapter_spans: Dict[tuple, tuple] = {}
+        for i, (book_num, chapter, _) in enumerate(self.verse_ids):
+            start, _ = self.chapter_spans.get((book_num, chapter), (i, i))
+            self.chapter_spans[(book_num, chapter)] = (start, i + 1)
+        # (début, fin) -> (livre, chapitre) : une référence couvre-t-elle un chapitre entier ?
+        self.chapter_by_span: Dict[tuple, tuple] = {span: key for key, span in self.chapter_spans.items()}
+        
+        books: Dict[int, List[tuple]] = {}
+        for key in self.chapter_spans:
+            books.setdefault(key[0], []).append(key)
+        
+        def compress_book(task: tuple) -> tuple:
+            lang, keys = task
+            start_time = time.perf_counter()
+            aligned, fragments = self.aligned[lang], self.fragments[lang]
+            payloads = []
+            for key in keys:
+                start, end = self.chapter_spans[key]
+                parts = [fragments[pos] for pos in aligned[start:end] if pos >= 0]
+                if parts:
+                    payloads.append((key, precompress(b"[" + b",".join(parts) + b"]")))
+            return payloads, time.perf_counter() - start_time
+        
+        tasks = [(lang, keys) for lang in self.aligned for keys in books.values()]
+        self.chapter_payloads: Dict[str, Dict[tuple, Dict[str, bytes]]] = {lang: {} for lang in self.aligned}
+        for (lang, _), (payloads, duration) in zip(tasks, parallel_map(compress_book, tasks, self.workers)):
+            self.chapter_payloads[lang].update(payloads)
+            # Temps de compression cumulé par langue (la durée "chapitres" est le temps réel)
+            self.timings[f"chapitres:{lang}"] = self.timings.get(f"chapitres:{lang}", 0.0) + duration
+    
+    def get_chapter_payloads(self, reference: str, language: str = "fr") -> Optional[Dict[str, bytes]]:
+        """
+        Retourne les réponses pré-compressées si la référence couvre exactement
+        un chapitre entier, sinon None.
+        """
+        spans = self.resolve_reference(reference)
+        if not spans or len(spans) != 1:
+            return None
+        key = self.chapter_by_span.get((spans[0].start, spans[0].stop))
+        if key is None:
+            return None
+        lang = language if language in self.chapter_payloads else "fr"
+        return self.chapter_payloads.get(lang, {}).get(key)
+    
+    def get_passage_json(self, reference: str, language: str = "fr") -> Optional[bytes]:
+        """
+        Retourne le tableau JSON d'un passage en concaténant les fragments pré-encodés,
+        ou None si aucun verset ne correspond.
+        """
+        spans = self.resolve_reference(reference)
+        if not spans:
+            return None
+        
+        lang = language if language in self.aligned else "fr"
+        if lang not in self.aligned:
+            return None
+        
+        fragments = self.fragments[lang]
+        parts = [fragments[pos] for pos in self._positions(spans, lang)]
+        if not parts:
+            return None
+        return b"[" + b",".join(parts) + b"]"
+    
+    def get_passages_json(self, references: List[str], language: str = "fr") -> Dict[str, Any]:
+        """
+        Résout plusieurs références en une fois : chacune est ramenée à sa plage
+        canonique, les doublons (ex: "Jean 3" et "jean  3") ne sont assemblés
+        qu'une fois. Retourne, par référence d'entrée, le JSON du passage (bytes)
+        ou un message d'erreur (str).
+        """
+        lang = language if language in self.aligned else "fr"
+        fragments = self.fragments.get(lang)
+        
+        spans: Dict[str, Any] = {}
+        for reference in references:
+            if reference in spans:
+                continue
+            resolved = self.resolve_reference(reference)
+            spans[reference] = tuple((r.start, r.stop) for r in resolved) if resolved is not None else None
+        
+        passages: Dict[tuple, Optional[bytes]] = {}
+        for key in sorted({span for span in spans.values() if span is not None}):
+            positions = self._positions([range(start, stop) for start, stop in key], lang) if fragments else []
+            passages[key] = b"[" + b",".join(fragments[pos] for pos in positions) + b"]" if positions else None
+        
+        results: Dict[str, Any] = {}
+        for reference, key in spans.items():
+            if key is None:
+                results[reference] = f"Format de référence non reconnu: '{reference}'"
+            elif passages[key] is None:
+                results[reference] = f"Verses not found for reference: {reference}"
+            else:
+                results[reference] = passages[key]
+        return results
+    
+    def get_parallel(self, reference: str, languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Retourne les versets d'une référence côte à côte dans plusieurs traductions,
+        en une seule résolution sur l'espace canonique.
+        Chaque ligne contient le verset de chaque langue (None si absent de cette traduction).
+        """
+        languages = [lang for lang in (languages or list(self.aligned)) if lang in self.aligned]
+        spans = self.resolve_reference(reference)
+        
+        if not spans or not languages:
+            return []
+        
+        rows = []
+        for i in (i for span in spans for i in span):
+            book_num, chapter, verse = self.verse_ids[i]
+            textes = {}
+            for lang in languages:
+                pos = self.aligned[lang][i]
+                textes[lang] = self.bibles[lang][pos] if pos >= 0 else None
+            rows.append({"book": book_num, "chapter": chapter, "verse": verse, "textes": textes})
+        return rows
+    
     def _normalize_book(self, book_name: str) -> str:
         """
         Normalise le nom d'un livre pour la comparaison.
         Gère les différences de casse et espaces.
         """
-        return book_name.strip().lower()
+        return " ".join(book_name.split()).lower()
+
+class BibleLoader:
+    """Gère le chargement des différentes versions de la Bible via fichiers locaux."""
+    
+    def __init__(self, files: Optional[Dict[str, str]] = None, autoload: bool = True):
+        self.files = dict(files or BIBLE_FILES)
+        # Snapshot vide tant que le chargement n'est pas terminé
+        self._snapshot: BibleSnapshot = BibleSnapshot({}, 0)
+        self._pinned: ContextVar = ContextVar("bible_snapshot", default=None)
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        if autoload:
+            self.load_local_bibles()
+    
+    def load_local_bibles(self):
+        """Charge les fichiers JSON locaux disponibles (FR et EN)."""
+        with self._reload_lock:
+            timings: Dict[str, float] = {}
+            bibles = self._read_files(strict=False, timings=timings)
+            self._snapshot = BibleSnapshot(bibles, self._snapshot.version + 1, timings)
+        self.ready.set()
+    
+    def warm_up(self, prechauffage: Optional[Callable[[], Any]] = None):
+        """
+        Chargement complet pour le démarrage en arrière-plan : fichiers, index de base
+        et index dérivés déclarés, puis `prechauffage` (remplissage des caches sur le
+        nouveau snapshot) s'il est fourni, et enfin signale que le service est prêt.
+        """
+        start = time.perf_counter()
+        with self._reload_lock:
+            timings: Dict[str, float] = {}
+            bibles = self._read_files(strict=False, timings=timings)
+            snapshot = BibleSnapshot(bibles, self._snapshot.version + 1, timings)
+            snapshot.build_registered_indexes()
+            self._snapshot = snapshot
+        print(f"🚀 Données chargées en {time.perf_counter() - start:.2f}s")
+        if prechauffage is not None:
+            try:
+                prechauffage()
+            except Exception as e:
+                print(f"⚠️  Préchauffage des caches interrompu: {e}")
+        self.ready.set()
+        print(f"🚀 Service prêt en {time.perf_counter() - start:.2f}s")
+    
+    def _read_files(self, strict: bool, timings: Optional[Dict[str, float]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Lit les fichiers de chaque langue (durée de lecture dans `timings` si fourni).
+        En mode strict (rechargement), une erreur est levée au lieu de remplacer
+        les données par une liste vide.
+        """
+        bibles = {}
+        
+        for lang, filename in self.files.items():
+            start = time.perf_counter()
+            try:
+                with open(filename, "r", encoding="utf-8") as f:
+                    raw_data = json.load(f)
+                    
+                    # ✅ Support des deux formats possibles
+                    if "verses" in raw_data:
+                        bibles[lang] = raw_data["verses"]
+                    elif isinstance(raw_data, list):
+                        bibles[lang] = raw_data
+                    else:
+                        if strict:
+                            raise ValueError(f"Format non reconnu dans {filename}")
+                        print(f"⚠️  Format non reconnu dans {filename}")
+                        bibles[lang] = []
+                    
+                    print(f"✅ {filename} chargé : {len(bibles[lang])} versets")
+                    
+            except FileNotFoundError:
+                if strict:
+                    raise
+                print(f"⚠️  Le fichier '{filename}' est introuvable.")
+                bibles[lang] = []
+            except json.JSONDecodeError as e:
+                if strict:
+                    raise
+                print(f"❌ Le fichier {filename} est mal formaté: {e}")
+                bibles[lang] = []
+            if timings is not None:
+                timings[f"lecture:{lang}"] = time.perf_counter() - start
+        
+        return bibles
+    
+    def reload(self) -> BibleSnapshot:
+        """
+        Recharge les fichiers et reconstruit les index à côté des données en service,
+        puis les substitue atomiquement. En cas d'erreur, l'ancien snapshot reste actif.
+        """
+        with self._reload_lock:
+            start = time.perf_counter()
+            version = self._snapshot.version + 1
+            timings: Dict[str, float] = {}
+            bibles = self._read_files(strict=True, timings=timings)
+            snapshot = BibleSnapshot(bibles, version, timings)
+            snapshot.build_registered_indexes()
+            self._snapshot = snapshot
+            self.ready.set()
+            print(f"🔄 Bible rechargée (version {version}) en {time.perf_counter() - start:.2f}s")
+            return snapshot
+    
+    @property
+    def snapshot(self) -> BibleSnapshot:
+        """Snapshot épinglé pour la requête en cours, sinon le snapshot actif."""
+        return self._pinned.get() or self._snapshot
+    
+    @contextmanager
+    def pinned(self, snapshot: Optional[BibleSnapshot] = None):
+        """
+        Épingle un snapshot (par défaut le snapshot actif) pour toute la durée d'une
+        requête, ou d'une tâche d'arrière-plan qui doit voir les mêmes données qu'elle.
+        """
+        snapshot = snapshot or self._snapshot
+        token = self._pinned.set(snapshot)
+        try:
+            yield snapshot
+        finally:
+            self._pinned.reset(token)
+    
+    # --- Accès délégués au snapshot courant ---
+    @property
+    def bibles(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.snapshot.bibles
+    
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+    
+    def get_verses(self, language: str = "fr") -> List[Dict[str, Any]]:
+        return self.snapshot.get_verses(language)
+    
+    def get_index(self, name: str, language: str = "fr") -> Any:
+        return self.snapshot.get_index(name, language)
+    
+    def is_api_mode(self, language: str) -> bool:
+        return self.snapshot.is_api_mode(language)
+    
+    def get_verses_for_reference(self, reference: str, language: str = "fr") -> List[Dict]:
+        return self.snapshot.get_verses_for_reference(reference, language)
+    
+    def get_positions(self, reference: str, language: str = "fr") -> List[int]:
+        return self.snapshot.get_positions(reference, language)
+    
+    def resolve_reference(self, reference: str) -> Optional[List[range]]:
+        return self.snapshot.resolve_reference(reference)
+
+    def canonical_reference(self, reference: str, language: str = "fr") -> Optional[str]:
+        return self.snapshot.canonical_reference(reference, language)
+
+    def get_passage_json(self, reference: str, language: str = "fr") -> Optional[bytes]:
+        return self.snapshot.get_passage_json(reference, language)
+    
+    def get_chapter_payloads(self, reference: str, language: str = "fr") -> Optional[Dict[str, bytes]]:
+        return self.snapshot.get_chapter_payloads(reference, language)
+    
+    def get_passages_json(self, references: List[str], language: str = "fr") -> Dict[str, Any]:
+        return self.snapshot.get_passages_json(references, language)
+    
+    def get_parallel(self, reference: str, languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return self.snapshot.get_parallel(reference, languages)
+    
+    # --- Surveillance des fichiers ---
+    def _file_mtimes(self) -> Dict[str, Optional[float]]:
+        mtimes = {}
+        for filename in self.files.values():
+            try:
+                mtimes[filename] = os.path.getmtime(filename)
+            except OSError:
+                mtimes[filename] = None
+        return mtimes
+    
+    def start_watcher(self, interval: float = 5.0):
+        """Démarre un thread qui recharge les données quand un fichier change."""
+        if self._watcher is not None:
+            return
+        
+        def watch():
+            known = self._file_mtimes()
+            while True:
+                time.sleep(interval)
+                current = self._file_mtimes()
+                if current == known:
+                    continue
+                # Attendre que l'écriture du fichier soit terminée
+                time.sleep(min(interval, 1.0))
+                if self._file_mtimes() != current:
+                    continue
+                try:
+                    self.reload()
+                    known = current
+                except Exception as e:
+                    print(f"❌ Rechargement automatique échoué, données actuelles conservées: {e}")
+                    known = current
+        
+        self._watcher = threading.Thread(target=watch, name="bible-watcher", daemon=True)
+        self._watcher.start()
+        print(f"👀 Surveillance des fichiers Bible toutes les {interval}s")
 
-# Instance globale
-bible_loader = BibleLoader()
\ No newline at end of file
+# Instance globale (chargée en arrière-plan au démarrage de l'application, voir main.py)
+bible_loader = BibleLoader(autoload=False)
\ No newline at end of file
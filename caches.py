@@ -0,0 +1,102 @@
+import functools
+import inspect
+import os
+import random
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from bible_loader import bible_loader
+from fast_json import dumps, loads
+
+SEEDED_CACHE_SIZE = int(os.environ.get("SEEDED_CACHE_SIZE", "1024"))
+
+# Tous les caches créés, pour les statistiques d'administration
+CACHES: List["LRUCache"] = []
+
+
+class LRUCache:
+    """Cache LRU borné et thread-safe, avec compteurs de succès / échecs."""
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        CACHES.append(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None
+        }
+
+
+# Réponses des requêtes avec graine (identiques pour une même requête et un même snapshot)
+seeded_cache = LRUCache("seeded", SEEDED_CACHE_SIZE)
+
+
+def seeded_rng(seed: Optional[int]):
+    """Générateur propre à la requête si une graine est fournie, sinon le module random global."""
+    return random.Random(seed) if seed is not None else random
+
+
+def memoize_seeded(func: Callable) -> Callable:
+    """
+    Mémorise la réponse d'une route (corps, request) quand la graine du corps est fournie.
+    Clé : route, langue, version des données et corps de la requête. Les requêtes liées
+    à un profil apprenant (qui évolue), les réponses d'erreur et les réponses dégradées
+    (distracteurs de secours pendant une panne de l'IA) ne sont pas mémorisées.
+    La réponse est gardée sérialisée : chaque appel reçoit sa propre copie, qu'il peut
+    modifier sans toucher à celle des appels suivants.
+    """
+    params = list(inspect.signature(func).parameters)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = dict(zip(params, args), **kwargs)
+        data, request = arguments[params[0]], arguments[params[1]]
+        if getattr(data, "seed", None) is None or getattr(data, "learner_id", None):
+            return func(*args, **kwargs)
+
+        key = (func.__name__, getattr(request.state, "language", "fr"),
+               bible_loader.version, data.model_dump_json())
+        cached = seeded_cache.get(key)
+        if cached is not None:
+            return loads(cached)
+        result = func(*args, **kwargs)
+        if not (isinstance(result, dict) and ("error" in result or result.get("degrade"))):
+            seeded_cache.put(key, dumps(result))
+        return result
+
+    return wrapper
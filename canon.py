@@ -0,0 +1,104 @@
+from typing import Dict, Optional
+from text_utils import normalize_text
+
+# Livres du canon protestant dans l'ordre canonique : (code OSIS, nom français, nom anglais).
+# Le numéro d'un livre est sa position dans cette table (1 à 66), quelle que soit
+# la traduction : un fichier qui omet ou réordonne des livres ne décale pas les autres.
+CANONICAL_BOOKS = [
+    ("Gen", "Genèse", "Genesis"),
+    ("Exod", "Exode", "Exodus"),
+    ("Lev", "Lévitique", "Leviticus"),
+    ("Num", "Nombres", "Numbers"),
+    ("Deut", "Deutéronome", "Deuteronomy"),
+    ("Josh", "Josué", "Joshua"),
+    ("Judg", "Juges", "Judges"),
+    ("Ruth", "Ruth", "Ruth"),
+    ("1Sam", "1 Samuel", "1 Samuel"),
+    ("2Sam", "2 Samuel", "2 Samuel"),
+    ("1Kgs", "1 Rois", "1 Kings"),
+    ("2Kgs", "2 Rois", "2 Kings"),
+    ("1Chr", "1 Chroniques", "1 Chronicles"),
+    ("2Chr", "2 Chroniques", "2 Chronicles"),
+    ("Ezra", "Esdras", "Ezra"),
+    ("Neh", "Néhémie", "Nehemiah"),
+    ("Esth", "Esther", "Esther"),
+    ("Job", "Job", "Job"),
+    ("Ps", "Psaumes", "Psalms"),
+    ("Prov", "Proverbes", "Proverbs"),
+    ("Eccl", "Ecclésiaste", "Ecclesiastes"),
+    ("Song", "Cantique des Cantiques", "Song of Solomon"),
+    ("Isa", "Ésaïe", "Isaiah"),
+    ("Jer", "Jérémie", "Jeremiah"),
+    ("Lam", "Lamentations", "Lamentations"),
+    ("Ezek", "Ézéchiel", "Ezekiel"),
+    ("Dan", "Daniel", "Daniel"),
+    ("Hos", "Osée", "Hosea"),
+    ("Joel", "Joël", "Joel"),
+    ("Amos", "Amos", "Amos"),
+    ("Obad", "Abdias", "Obadiah"),
+    ("Jonah", "Jonas", "Jonah"),
+    ("Mic", "Michée", "Micah"),
+    ("Nah", "Nahum", "Nahum"),
+    ("Hab", "Habacuc", "Habakkuk"),
+    ("Zeph", "Sophonie", "Zephaniah"),
+    ("Hag", "Aggée", "Haggai"),
+    ("Zech", "Zacharie", "Zechariah"),
+    ("Mal", "Malachie", "Malachi"),
+    ("Matt", "Matthieu", "Matthew"),
+    ("Mark", "Marc", "Mark"),
+    ("Luke", "Luc", "Luke"),
+    ("John", "Jean", "John"),
+    ("Acts", "Actes", "Acts"),
+    ("Rom", "Romains", "Romans"),
+    ("1Cor", "1 Corinthiens", "1 Corinthians"),
+    ("2Cor", "2 Corinthiens", "2 Corinthians"),
+    ("Gal", "Galates", "Galatians"),
+    ("Eph", "Éphésiens", "Ephesians"),
+    ("Phil", "Philippiens", "Philippians"),
+    ("Col", "Colossiens", "Colossians"),
+    ("1Thess", "1 Thessaloniciens", "1 Thessalonians"),
+    ("2Thess", "2 Thessaloniciens", "2 Thessalonians"),
+    ("1Tim", "1 Timothée", "1 Timothy"),
+    ("2Tim", "2 Timothée", "2 Timothy"),
+    ("Titus", "Tite", "Titus"),
+    ("Phlm", "Philémon", "Philemon"),
+    ("Heb", "Hébreux", "Hebrews"),
+    ("Jas", "Jacques", "James"),
+    ("1Pet", "1 Pierre", "1 Peter"),
+    ("2Pet", "2 Pierre", "2 Peter"),
+    ("1John", "1 Jean", "1 John"),
+    ("2John", "2 Jean", "2 John"),
+    ("3John", "3 Jean", "3 John"),
+    ("Jude", "Jude", "Jude"),
+    ("Rev", "Apocalypse", "Revelation"),
+]
+
+# Autres noms courants rencontrés dans les fichiers (clé normalisée -> code OSIS)
+ALIASES = {
+    "psaume": "Ps",
+    "cantique": "Song",
+    "songofsongs": "Song",
+    "canticles": "Song",
+    "qohelet": "Eccl",
+    "revelationofjohn": "Rev",
+    "revelations": "Rev",
+}
+
+
+def book_key(name: str) -> str:
+    """Clé de comparaison d'un nom de livre : minuscules, sans accents, espaces ni ponctuation."""
+    return "".join(normalize_text(name).split())
+
+
+_NUMBERS: Dict[str, int] = {}
+for _num, _noms in enumerate(CANONICAL_BOOKS, start=1):
+    for _nom in _noms:
+        _NUMBERS[book_key(_nom)] = _num
+_OSIS_NUMBERS = {osis: num for num, (osis, _, _) in enumerate(CANONICAL_BOOKS, start=1)}
+for _alias, _osis in ALIASES.items():
+    _NUMBERS[_alias] = _OSIS_NUMBERS[_osis]
+
+
+def canonical_book_number(name: str) -> Optional[int]:
+    """Numéro canonique (1 à 66) d'un livre d'après son nom français, anglais ou son code OSIS."""
+    return _NUMBERS.get(book_key(name))
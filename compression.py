@@ -0,0 +1,52 @@
+import gzip
+import os
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli absent : seules les versions gzip sont produites
+    brotli = None
+
+BROTLI_QUALITY = int(os.environ.get("BIBLE_BROTLI_QUALITY", "9"))
+GZIP_LEVEL = int(os.environ.get("BIBLE_GZIP_LEVEL", "9"))
+
+
+def precompress(data: bytes) -> Dict[str, bytes]:
+    """Retourne le contenu brut et ses versions compressées, par Content-Encoding."""
+    payloads = {
+        "identity": data,
+        "gzip": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0),
+    }
+    if brotli is not None:
+        payloads["br"] = brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    return payloads
+
+
+def choose_encoding(accept_encoding: Optional[str], available) -> str:
+    """
+    Choisit le meilleur encodage disponible selon l'en-tête Accept-Encoding
+    (q-values respectées, brotli préféré à gzip à poids égal).
+    """
+    if not accept_encoding:
+        return "identity"
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            weights[token] = q
+
+    best, best_q = "identity", 0.0
+    for encoding in ("br", "gzip"):
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if encoding in available and q > best_q:
+            best, best_q = encoding, q
+    return best
@@ -0,0 +1,120 @@
+import random
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from bible_loader import BibleSnapshot, register_index
+from text_utils import normalize_text
+
+# Bandes : longueur par pas de 2 lettres, fréquence par puissance de 2
+MAX_LENGTH_BAND = 6
+MAX_FREQUENCY_BAND = 10
+
+
+def length_band(word: str) -> int:
+    return min(len(word), 2 * MAX_LENGTH_BAND + 1) // 2
+
+
+def frequency_band(count: int) -> int:
+    return min(max(count, 1).bit_length() - 1, MAX_FREQUENCY_BAND)
+
+
+class DistractorIndex:
+    """
+    Vocabulaire d'une langue (mots de plus de 3 lettres, normalisés) rangé par
+    (bande de longueur, bande de fréquence), pour toute la Bible, pour chaque livre
+    et pour chaque chapitre (livre, chapitre). Un distracteur au même profil que le mot correct se tire en temps constant.
+    """
+
+    def __init__(self, snapshot: BibleSnapshot, lang: str):
+        counts: Counter = Counter()
+        book_words: Dict[int, set] = defaultdict(set)
+        chapter_words: Dict[Tuple[int, int], set] = defaultdict(set)
+
+        for v in snapshot.bibles.get(lang, []):
+            book = snapshot.book_number(v.get("book_name", ""))
+            chapter = (book, v.get("chapter"))
+            for mot in v.get("text", "").split():
+                if len(mot) > 3:
+                    word = normalize_text(mot)
+                    if word:
+                        counts[word] += 1
+                        book_words[book].add(word)
+                        chapter_words[chapter].add(word)
+
+        self.counts = counts
+        self.book_words = dict(book_words)
+        self.buckets = self._bucketize(counts)
+        self.book_buckets = {book: self._bucketize(counts, words) for book, words in book_words.items()}
+        self.chapter_buckets = {key: self._bucketize(counts, words) for key, words in chapter_words.items()}
+
+    def _bucketize(self, counts: Counter, words: Optional[Iterable[str]] = None) -> Dict[Tuple[int, int], List[str]]:
+        buckets: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        # Ordre trié : un tirage avec une graine donnée reste reproductible
+        for word in sorted(words if words is not None else counts):
+            buckets[(length_band(word), frequency_band(counts[word]))].append(word)
+        return dict(buckets)
+
+    def profile(self, word: str) -> Tuple[int, int]:
+        word = normalize_text(word)
+        return length_band(word), frequency_band(self.counts.get(word, 1))
+
+    def sample(self, word: str, k: int = 3, rng=random, book: Optional[int] = None,
+               exclude_book: Optional[int] = None, chapter: Optional[Tuple[int, int]] = None) -> List[str]:
+        """
+        Tire jusqu'à k distracteurs au profil le plus proche de `word` :
+        - book : uniquement des mots de ce livre
+        - chapter : uniquement des mots de ce chapitre (livre, chapitre)
+        - exclude_book : uniquement des mots absents de ce livre
+        Les bandes voisines sont utilisées si la bande exacte ne suffit pas.
+        """
+        if chapter is not None:
+            buckets = self.chapter_buckets.get(chapter, {})
+        elif book is not None:
+            buckets = self.book_buckets.get(book, {})
+        else:
+            buckets = self.buckets
+        excluded = self.book_words.get(exclude_book, set()) if exclude_book is not None else set()
+        cible = normalize_text(word)
+        lb, fb = self.profile(word)
+        choisis: List[str] = []
+
+        for distance in range(MAX_LENGTH_BAND + MAX_FREQUENCY_BAND + 1):
+            for dl in range(-distance, distance + 1):
+                df_abs = distance - abs(dl)
+                for df in ((df_abs, -df_abs) if df_abs else (0,)):
+                    bucket = buckets.get((lb + dl, fb + df))
+                    if not bucket:
+                        continue
+                    for _ in range(4 * k):
+                        if len(choisis) >= k:
+                            return choisis
+                        candidat = bucket[rng.randrange(len(bucket))]
+                        if candidat != cible and candidat not in choisis and candidat not in excluded:
+                            choisis.append(candidat)
+            if len(choisis) >= k:
+                break
+        return choisis
+
+    def sample_for_level(self, word: str, niveau: str, k: int = 3, rng=random,
+                         book: Optional[int] = None, chapter: Optional[int] = None) -> List[str]:
+        """
+        Distracteurs selon le niveau de la question :
+        - facile : mots absents du livre du verset
+        - moyen : mots du même livre
+        - difficile : mots du même chapitre, complétés par le livre si le chapitre est trop court
+        """
+        niveau = niveau.lower()
+        if niveau == "facile":
+            return self.sample(word, k, rng, exclude_book=book)
+        if niveau == "difficile":
+            choisis = self.sample(word, k, rng, chapter=(book, chapter))
+            if len(choisis) < k:
+                for mot in self.sample(word, 2 * k, rng, book=book):
+                    if len(choisis) >= k:
+                        break
+                    if mot not in choisis:
+                        choisis.append(mot)
+            return choisis
+        return self.sample(word, k, rng, book=book)
+
+
+register_index("distracteurs", DistractorIndex)
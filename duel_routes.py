@@ -2,9 +2,17 @@ from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 import json
 import random
-import re
+import time
+import uuid
 from typing import List, Optional
+import numpy as np
 from bible_loader import bible_loader
+from duel_sessions import DUEL_SESSION_TTL, duel_store
+from learner_store import learner_store
+from caches import memoize_seeded, seeded_rng
+from text_utils import normalize_text
+import distractors  # noqa: F401  (déclare l'index "distracteurs")
+import texte_trous  # noqa: F401  (déclare l'index "tokens")
 
 router = APIRouter()
 
@@ -21,85 +29,74 @@ def parse_and_fetch_verses(reference: str, request: Request) -> List[dict]:
     
     return verses
 
-def normalize_text(s: str) -> str:
-    s = s.lower().strip()
-    replacements = {
-        "á":"a","à":"a","â":"a","ä":"a",
-        "é":"e","è":"e","ê":"e","ë":"e",
-        "í":"i","î":"i","ï":"i",
-        "ó":"o","ô":"o","ö":"o",
-        "ú":"u","ù":"u","û":"u","ü":"u",
-        "ç":"c",
-    }
-    for a, b in replacements.items():
-        s = s.replace(a, b)
-    import string
-    return s.translate(str.maketrans('', '', string.punctuation))
-
 # --- Modèles ---
 class BatchQcmRequest(BaseModel):
     reference: str
     niveau: str
     nombre: int
     mots_deja_utilises: Optional[List[str]] = None
+    learner_id: Optional[str] = None
+    seed: Optional[int] = None
 
 class ReferenceRequest(BaseModel):
     reference: str
     niveau: str
     mots_deja_utilises: Optional[List[str]] = None
+    learner_id: Optional[str] = None
+
+class DuelSessionRequest(BaseModel):
+    reference: str
+    niveau: str
+    nombre: int = 10
+    types: Optional[List[str]] = None
+    seed: Optional[int] = None
+
+TYPES_DE_JEU = ("qcm", "texte_a_trous", "ordre")
 
 # --- Génération QCM ---
-def jeu_qcm_single(data: ReferenceRequest, request: Request):
+def jeu_qcm_single(data: ReferenceRequest, request: Request, rng=random):
     try:
         versets_selectionnes = parse_and_fetch_verses(data.reference, request)
         
         if not versets_selectionnes:
             return {"error": "Aucun verset trouvé."}
         
-        verset_question = random.choice(versets_selectionnes)
+        verset_question = rng.choice(versets_selectionnes)
         mots_utilises = {normalize_text(mot) for mot in (data.mots_deja_utilises or [])}
         
         mots = verset_question["text"].split()
         mots_eligibles = {normalize_text(mot) for mot in mots if len(mot) > 3}
-        mots_non_utilises = list(mots_eligibles - mots_utilises) or list(mots_eligibles)
+        mots_non_utilises = list(mots_eligibles - mots_utilises)
+        if data.learner_id:
+            est_appris = learner_store.learned_checker(data.learner_id, getattr(request.state, "language", "fr"))
+            mots_non_utilises = [mot for mot in mots_non_utilises if not est_appris(mot)]
+        mots_non_utilises = sorted(mots_non_utilises) or sorted(mots_eligibles)
         
         if not mots_non_utilises:
             return {"error": "Aucun mot disponible."}
         
-        mot_correct = random.choice(mots_non_utilises)
+        mot_correct = rng.choice(mots_non_utilises)
         mot_a_retirer = next((mot for mot in mots if normalize_text(mot) == mot_correct), mot_correct)
         
         # ✅ SIMPLIFIÉ : Génération des distracteurs pour FR et EN
         mauvais_mots = set()
         language = getattr(request.state, "language", "fr")
         
-        # Récupérer tous les versets de la langue actuelle
-        pool_autres = bible_loader.get_verses(language)
-        
-        if data.niveau.lower() == "facile":
-            pool = [v for v in pool_autres if v.get("book_name") != verset_question.get("book_name")]
-        elif data.niveau.lower() == "difficile":
-            pool = [v for v in pool_autres if v.get("book_name") == verset_question.get("book_name") 
-                                         and v.get("chapter") == verset_question.get("chapter")]
-        else:
-            pool = [v for v in pool_autres if v.get("book_name") == verset_question.get("book_name")]
-        
-        random.shuffle(pool)
-        while len(mauvais_mots) < 3 and pool:
-            mots_option = pool.pop()['text'].split()
-            mots_propres = {normalize_text(m) for m in mots_option if len(m) > 3}
-            mots_propres.discard(mot_correct.lower())
-            if mots_propres:
-                mauvais_mots.add(random.choice(list(mots_propres)))
+        # Distracteurs au même profil (longueur, fréquence) que le mot correct
+        index = bible_loader.get_index("distracteurs", language)
+        livre = bible_loader.snapshot.book_number(verset_question.get("book_name", ""))
+        mauvais_mots.update(index.sample_for_level(
+            mot_correct, data.niveau, 3, rng, book=livre, chapter=verset_question.get("chapter")
+        ))
         
         # Fallback si pas assez de distracteurs
         while len(mauvais_mots) < 3:
             fallback = ["love", "peace", "faith", "hope"] if language == "en" else ["amour", "paix", "joie", "foi"]
-            mauvais_mots.add(random.choice(fallback))
+            mauvais_mots.add(rng.choice(fallback))
         
         question = verset_question["text"].replace(mot_a_retirer, "_____", 1)
-        options = list(mauvais_mots) + [mot_correct]
-        random.shuffle(options)
+        options = sorted(mauvais_mots) + [mot_correct]
+        rng.shuffle(options)
         
         ref = f"{verset_question['book_name']} {verset_question['chapter']}:{verset_question['verse']}"
         return {
@@ -111,27 +108,9 @@ def jeu_qcm_single(data: ReferenceRequest, request: Request):
     except Exception as e:
         return {"error": f"Erreur: {e}"}
 
-# --- Routes ---
-# Ajoutez ces validations au début de votre fonction generer_qcm_batch dans duel_routes.py
-
-@router.post("/qcm/batch")
-def generer_qcm_batch(data: BatchQcmRequest, request: Request):
-    """Génère un batch de QCM avec support multilingue."""
-    
-    # ✅ AJOUT 1 : Validation du nombre
-    if data.nombre <= 0:
-        raise HTTPException(
-            status_code=400, 
-            detail="Le nombre doit être supérieur à 0"
-        )
-    
-    # ✅ AJOUT 2 : Limiter le nombre maximum
-    if data.nombre > 20:
-        raise HTTPException(
-            status_code=400, 
-            detail="Le nombre maximum est 20"
-        )
-    
+# --- Générateurs (partagés par les routes batch et les sessions de duel) ---
+def generer_questions_qcm(data: BatchQcmRequest, request: Request, rng=random) -> List[dict]:
+    """Génère jusqu'à `data.nombre` questions QCM sans répéter les mots."""
     questions, mots_deja = [], set(data.mots_deja_utilises or [])
     
     # ✅ AJOUT 3 : Gestion si pas assez de mots disponibles
@@ -145,9 +124,11 @@ def generer_qcm_batch(data: BatchQcmRequest, request: Request):
             ReferenceRequest(
                 reference=data.reference,
                 niveau=data.niveau,
-                mots_deja_utilises=list(mots_deja)
+                mots_deja_utilises=sorted(mots_deja),
+                learner_id=data.learner_id
             ),
-            request
+            request,
+            rng
         )
         
         if "error" in q:
@@ -161,84 +142,168 @@ def generer_qcm_batch(data: BatchQcmRequest, request: Request):
             "reference": q["reference"]
         })
     
-    # ✅ AJOUT 4 : Message si pas assez de questions générées
-    if not questions:
-        raise HTTPException(
-            status_code=500, 
-            detail="Impossible de générer des questions pour cette référence."
-        )
-    
-    # ✅ MODIFICATION : Ne pas lever d'erreur si moins de questions, juste retourner ce qui est disponible
-    return {"questions": questions}
+    return questions
 
-@router.post("/duel/texte-a-trous/batch")
-def generer_texte_trous_batch(data: BatchQcmRequest, request: Request):
-    """Génère un batch de jeux texte à trous avec support multilingue."""
+def generer_jeux_texte_trous(positions: List[int], nombre: int, niveau: str, language: str, rng=random) -> List[dict]:
+    """
+    Génère jusqu'à `nombre` jeux de texte à trous parmi les versets `positions`,
+    en un seul passage vectorisé sur l'index des mots (texte_trous.TokenIndex).
+    """
+    index = bible_loader.get_index("tokens", language)
+    return index.generer_batch(positions, nombre, niveau, np.random.default_rng(rng.getrandbits(64)))
+
+def generer_jeux_ordre(versets_selectionnes: List[dict], nombre: int, rng=random) -> List[dict]:
+    """Génère jusqu'à `nombre` jeux de remise en ordre à partir des versets donnés."""
     jeux = []
-    versets_selectionnes = parse_and_fetch_verses(data.reference, request)
     
-    for _ in range(data.nombre):
+    for _ in range(nombre):
         if not versets_selectionnes:
             continue
         
-        v = random.choice(versets_selectionnes)
+        v = rng.choice(versets_selectionnes)
         mots = v["text"].split()
-        difficulte = {"facile": 2, "moyen": 4, "difficile": 6}
-        nb_cacher = min(difficulte.get(data.niveau.lower(), 2), len(mots)//2)
         
-        indices = [i for i, mot in enumerate(mots) if len(mot) > 3]
-        if not indices:
+        if len(mots) < 5:
             continue
         
-        random.shuffle(indices)
-        choisis = sorted(indices[:nb_cacher])
-        
-        reponses = [re.sub(r'[^\w\s-]', '', mots[i]) for i in choisis]
-        for i in choisis:
-            mots[i] = "_____"
+        melanges = mots.copy()
+        rng.shuffle(melanges)
         
         ref = f"{v['book_name']} {v['chapter']}:{v['verse']}"
         jeux.append({
-            "verset_modifie": " ".join(mots),
-            "reponses": reponses,
-            "indices": choisis,
-            "reference": ref,
-            "texte_original": v["text"]
+            "mots_melanges": melanges,
+            "ordre_correct": mots,
+            "texte_original": v["text"],
+            "reference": ref
         })
     
+    return jeux
+
+# --- Routes ---
+def verifier_nombre(nombre: int):
+    """Limite commune des lots et des sessions de duel : la génération alloue nombre x longueur du verset."""
+    if nombre <= 0:
+        raise HTTPException(status_code=400, detail="Le nombre doit être supérieur à 0")
+    if nombre > 20:
+        raise HTTPException(status_code=400, detail="Le nombre maximum est 20")
+
+@router.post("/qcm/batch")
+@memoize_seeded
+def generer_qcm_batch(data: BatchQcmRequest, request: Request):
+    """Génère un batch de QCM avec support multilingue."""
+    verifier_nombre(data.nombre)
+    
+    questions = generer_questions_qcm(data, request, seeded_rng(data.seed))
+    
+    # ✅ AJOUT 4 : Message si pas assez de questions générées
+    if not questions:
+        raise HTTPException(
+            status_code=500, 
+            detail="Impossible de générer des questions pour cette référence."
+        )
+    
+    # ✅ MODIFICATION : Ne pas lever d'erreur si moins de questions, juste retourner ce qui est disponible
+    return {"questions": questions}
+
+@router.post("/duel/texte-a-trous/batch")
+@memoize_seeded
+def generer_texte_trous_batch(data: BatchQcmRequest, request: Request):
+    """Génère un batch de jeux texte à trous avec support multilingue."""
+    verifier_nombre(data.nombre)
+    language = getattr(request.state, "language", "fr")
+    positions = bible_loader.get_positions(data.reference, language)
+    
+    if not positions:
+        raise HTTPException(404, f"Verses not found for reference: {data.reference}")
+    
+    jeux = generer_jeux_texte_trous(positions, data.nombre, data.niveau, language, seeded_rng(data.seed))
+    
     if not jeux:
         raise HTTPException(500, "Impossible de générer les jeux.")
     
     return {"jeux": jeux}
 
 @router.post("/duel/ordre/batch")
+@memoize_seeded
 def generer_ordre_batch(data: BatchQcmRequest, request: Request):
     """Génère un batch de jeux de remise en ordre avec support multilingue."""
-    jeux = []
+    verifier_nombre(data.nombre)
     versets_selectionnes = parse_and_fetch_verses(data.reference, request)
-    
-    for _ in range(data.nombre):
-        if not versets_selectionnes:
-            continue
-        
-        v = random.choice(versets_selectionnes)
-        mots = v["text"].split()
-        
-        if len(mots) < 5:
-            continue
-        
-        melanges = mots.copy()
-        random.shuffle(melanges)
-        
-        ref = f"{v['book_name']} {v['chapter']}:{v['verse']}"
-        jeux.append({
-            "mots_melanges": melanges,
-            "ordre_correct": mots,
-            "texte_original": v["text"],
-            "reference": ref
-        })
+    jeux = generer_jeux_ordre(versets_selectionnes, data.nombre, seeded_rng(data.seed))
     
     if not jeux:
         raise HTTPException(500, "Impossible de générer les jeux de remise en ordre.")
     
-    return {"jeux": jeux}
\ No newline at end of file
+    return {"jeux": jeux}
+
+# --- Sessions de duel partagées ---
+@router.post("/duel/session")
+def creer_session_duel(data: DuelSessionRequest, request: Request):
+    """
+    Crée un duel : le batch de manches est généré une seule fois (avec une graine)
+    puis stocké, et les deux joueurs le récupèrent via son identifiant.
+    """
+    verifier_nombre(data.nombre)
+    
+    types = data.types or list(TYPES_DE_JEU)
+    inconnus = [t for t in types if t not in TYPES_DE_JEU]
+    if inconnus:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Types de jeu inconnus: {', '.join(inconnus)} (attendus: {', '.join(TYPES_DE_JEU)})"
+        )
+    
+    seed = data.seed if data.seed is not None else random.randrange(2**31)
+    rng = random.Random(seed)
+    language = getattr(request.state, "language", "fr")
+    versets_selectionnes = parse_and_fetch_verses(data.reference, request)
+    
+    # Répartition des manches entre les types demandés
+    quotas = {t: data.nombre // len(types) for t in types}
+    for t in types[:data.nombre % len(types)]:
+        quotas[t] += 1
+    
+    manches = []
+    for type_jeu in types:
+        if not quotas[type_jeu]:
+            continue
+        if type_jeu == "qcm":
+            jeux = generer_questions_qcm(
+                BatchQcmRequest(reference=data.reference, niveau=data.niveau, nombre=quotas[type_jeu]),
+                request,
+                rng
+            )
+        elif type_jeu == "texte_a_trous":
+            positions = bible_loader.get_positions(data.reference, language)
+            jeux = generer_jeux_texte_trous(positions, quotas[type_jeu], data.niveau, language, rng)
+        else:
+            jeux = generer_jeux_ordre(versets_selectionnes, quotas[type_jeu], rng)
+        manches.extend({"type": type_jeu, "jeu": jeu} for jeu in jeux)
+    
+    if not manches:
+        raise HTTPException(500, "Impossible de générer les manches du duel.")
+    
+    rng.shuffle(manches)
+    
+    session_id = uuid.uuid4().hex
+    session = {
+        "session_id": session_id,
+        "reference": data.reference,
+        "niveau": data.niveau,
+        "language": language,
+        "seed": seed,
+        "expires_at": int(time.time()) + DUEL_SESSION_TTL,
+        "manches": manches
+    }
+    duel_store.put(session_id, session, DUEL_SESSION_TTL)
+    return session
+
+@router.get("/duel/session/{session_id}")
+def get_session_duel(session_id: str):
+    """Récupère une session de duel existante (identique pour les deux joueurs)."""
+    session = duel_store.get(session_id)
+    
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session de duel '{session_id}' introuvable ou expirée.")
+    
+    return session
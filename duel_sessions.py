@@ -0,0 +1,162 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+# Durée de vie par défaut d'une session de duel (en secondes)
+DUEL_SESSION_TTL = int(os.environ.get("DUEL_SESSION_TTL", "1800"))
+
+
+class DuelStore(ABC):
+    """Interface commune des stockages de sessions de duel."""
+
+    @abstractmethod
+    def put(self, session_id: str, payload: Dict[str, Any], ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def claim(self, session_id: str, owner: str, previous: Optional[str] = None) -> Optional[str]:
+        """
+        Attribue la session à `owner` si elle n'a pas encore de propriétaire (ou si son
+        propriétaire est `previous`) ; retourne le propriétaire effectif, None si la
+        session est introuvable ou expirée.
+        """
+        ...
+
+
+class MemoryDuelStore(DuelStore):
+    """Stockage en mémoire du processus (un seul worker)."""
+
+    def __init__(self):
+        self._sessions: Dict[str, tuple] = {}
+        self._owners: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def put(self, session_id: str, payload: Dict[str, Any], ttl: int) -> None:
+        with self._lock:
+            self._purge_expired()
+            self._sessions[session_id] = (time.time() + ttl, payload)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.time():
+                self._remove(session_id)
+                return None
+            return payload
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._remove(session_id)
+
+    def claim(self, session_id: str, owner: str, previous: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry[0] < time.time():
+                return None
+            if self._owners.get(session_id) in (None, previous):
+                self._owners[session_id] = owner
+            return self._owners[session_id]
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [sid for sid, (expires_at, _) in self._sessions.items() if expires_at < now]
+        for sid in expired:
+            self._remove(sid)
+
+    def _remove(self, session_id: str):
+        """Retire une session et son propriétaire (verrou déjà pris)."""
+        self._sessions.pop(session_id, None)
+        self._owners.pop(session_id, None)
+
+
+class SqliteDuelStore(DuelStore):
+    """Stockage dans un fichier SQLite local, partagé entre les workers d'une même machine."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS duel_sessions ("
+            "id TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL, owner TEXT)"
+        )
+        try:
+            # Bases créées avant la colonne owner (worker qui héberge la salle temps réel)
+            self._conn.execute("ALTER TABLE duel_sessions ADD COLUMN owner TEXT")
+        except sqlite3.OperationalError:
+            pass
+        self._conn.commit()
+
+    def put(self, session_id: str, payload: Dict[str, Any], ttl: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM duel_sessions WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO duel_sessions (id, payload, expires_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(payload, ensure_ascii=False), now + ttl),
+            )
+            self._conn.commit()
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM duel_sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM duel_sessions WHERE id = ?", (session_id,))
+            self._conn.commit()
+
+    def claim(self, session_id: str, owner: str, previous: Optional[str] = None) -> Optional[str]:
+        # UPDATE conditionnel : un seul worker peut prendre la session
+        with self._lock:
+            self._conn.execute(
+                "UPDATE duel_sessions SET owner = ? WHERE id = ? AND expires_at >= ? "
+                "AND (owner IS NULL OR owner = ?)",
+                (owner, session_id, time.time(), previous),
+            )
+            self._conn.commit()
+            row = self._conn.execute(
+                "SELECT owner, expires_at FROM duel_sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+
+def create_duel_store() -> DuelStore:
+    """
+    Choisit le stockage selon l'environnement :
+    - DUEL_STORE=memory (défaut) : en mémoire
+    - DUEL_STORE=sqlite : fichier local (DUEL_STORE_PATH), pour plusieurs workers
+    """
+    kind = os.environ.get("DUEL_STORE", "memory").lower()
+    if kind == "sqlite":
+        path = os.environ.get("DUEL_STORE_PATH", "duel_sessions.db")
+        print(f"✅ Sessions de duel stockées dans {path}")
+        return SqliteDuelStore(path)
+    return MemoryDuelStore()
+
+
+# Instance globale
+duel_store = create_duel_store()
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+from duel_sessions import duel_store
+from game_routes import are_strings_similar
+
+# Joueurs par salle (une salle = une session de duel créée par POST /duel/session)
+DUEL_WS_MAX_JOUEURS = int(os.environ.get("DUEL_WS_MAX_JOUEURS", "2"))
+
+# Champs retirés des manches envoyées aux joueurs (ils donneraient la réponse)
+CHAMPS_SECRETS = {
+    "qcm": ("answer",),
+    "texte_a_trous": ("reponses", "texte_original"),
+    "ordre": ("ordre_correct", "texte_original"),
+}
+
+# Identifiant de ce worker dans le stockage des sessions (propriétaire des salles)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Code de fermeture quand la salle est ouverte sur un autre worker (cf. HTTP 421)
+CODE_AUTRE_WORKER = 4421
+
+router = APIRouter()
+
+
+def worker_actif(worker_id: str) -> bool:
+    """Le worker propriétaire tourne-t-il encore ? (vérifiable seulement sur la même machine)"""
+    hote, _, pid = worker_id.rpartition(":")
+    if hote != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+def reserver_salle(session_id: str) -> Optional[str]:
+    """
+    Attribue la salle à ce worker dans le stockage des sessions ; reprend la salle d'un
+    worker arrêté. Retourne le propriétaire effectif (None : session introuvable).
+    """
+    proprietaire = duel_store.claim(session_id, WORKER_ID)
+    if proprietaire not in (None, WORKER_ID) and not worker_actif(proprietaire):
+        proprietaire = duel_store.claim(session_id, WORKER_ID, previous=proprietaire)
+    return proprietaire
+
+
+def noter(manche: Dict[str, Any], reponse: Any) -> Tuple[bool, Any]:
+    """Retourne (correct, réponse attendue) pour une manche, avec la même tolérance que /verifier."""
+    jeu = manche["jeu"]
+    if manche["type"] == "qcm":
+        attendu = jeu["answer"]
+        return isinstance(reponse, str) and are_strings_similar(reponse, attendu), attendu
+    if manche["type"] == "texte_a_trous":
+        attendu = jeu["reponses"]
+        correct = isinstance(reponse, list) and len(reponse) == len(attendu) and all(
+            isinstance(r, str) and are_strings_similar(r, a) for r, a in zip(reponse, attendu)
+        )
+        return correct, attendu
+    attendu = jeu["ordre_correct"]
+    return reponse == attendu, attendu
+
+
+class Joueur:
+    def __init__(self, nom: str):
+        self.nom = nom
+        self.socket: Optional[WebSocket] = None
+        self.index = 0
+        self.score = 0
+        self.termine_a: Optional[float] = None
+
+    def etat(self) -> Dict[str, Any]:
+        return {"joueur": self.nom, "index": self.index, "score": self.score,
+                "connecte": self.socket is not None, "termine": self.termine_a is not None}
+
+
+class DuelRoom:
+    """
+    Salle de duel en mémoire du worker : chaque joueur avance à son rythme dans les
+    manches de la session, les scores et la progression sont diffusés à toute la salle.
+    Toutes les opérations ont lieu dans la boucle asyncio (pas de verrou nécessaire).
+    """
+
+    def __init__(self, session: Dict[str, Any]):
+        self.session_id = session["session_id"]
+        self.expires_at: float = session.get("expires_at", time.time())
+        self.manches: List[Dict[str, Any]] = session["manches"]
+        self.joueurs: Dict[str, Joueur] = {}
+        self.debut: Optional[float] = None
+
+    def peut_rejoindre(self, nom: str) -> bool:
+        joueur = self.joueurs.get(nom)
+        if joueur is not None:
+            return joueur.socket is None  # reconnexion, pas de double connexion
+        return len(self.joueurs) < DUEL_WS_MAX_JOUEURS
+
+    def connectes(self) -> List[Joueur]:
+        return [j for j in self.joueurs.values() if j.socket is not None]
+
+    async def envoyer(self, joueur: Joueur, message: Dict[str, Any]):
+        if joueur.socket is None:
+            return
+        try:
+            await joueur.socket.send_json(message)
+        except Exception:
+            joueur.socket = None  # connexion perdue : le joueur pourra se reconnecter
+
+    async def diffuser(self, message: Dict[str, Any]):
+        await asyncio.gather(*(self.envoyer(j, message) for j in self.connectes()))
+
+    async def diffuser_joueurs(self):
+        await self.diffuser({"type": "joueurs", "joueurs": [j.etat() for j in self.joueurs.values()]})
+
+    async def envoyer_question(self, joueur: Joueur):
+        if joueur.index >= len(self.manches):
+            await self.envoyer(joueur, {"type": "termine", "score": joueur.score})
+            return
+        manche = self.manches[joueur.index]
+        secrets = CHAMPS_SECRETS.get(manche["type"], ())
+        await self.envoyer(joueur, {
+            "type": "question",
+            "index": joueur.index,
+            "total": len(self.manches),
+            "manche": {"type": manche["type"],
+                       "jeu": {k: v for k, v in manche["jeu"].items() if k not in secrets}}
+        })
+
+    async def demarrer(self):
+        self.debut = time.monotonic()
+        await self.diffuser({"type": "debut", "total": len(self.manches)})
+        await asyncio.gather(*(self.envoyer_question(j) for j in self.connectes()))
+
+    async def repondre(self, joueur: Joueur, message: Dict[str, Any]):
+        if self.debut is None:
+            await self.envoyer(joueur, {"type": "erreur", "detail": "Le duel n'a pas commencé."})
+            return
+        if message.get("index") != joueur.index or joueur.index >= len(self.manches):
+            await self.envoyer(joueur, {"type": "erreur", "detail": "Réponse hors séquence.", "index": joueur.index})
+            return
+
+        correct, attendu = noter(self.manches[joueur.index], message.get("reponse"))
+        if correct:
+            joueur.score += 1
+        await self.envoyer(joueur, {"type": "resultat", "index": joueur.index, "correct": correct,
+                                    "reponse_correcte": attendu, "score": joueur.score})
+        joueur.index += 1
+        if joueur.index >= len(self.manches):
+            joueur.termine_a = time.monotonic()
+
+        await self.diffuser({"type": "progression", **joueur.etat()})
+        await self.envoyer_question(joueur)
+        if all(j.termine_a is not None for j in self.joueurs.values()):
+            await self.diffuser(self.resultat_final())
+
+    def resultat_final(self) -> Dict[str, Any]:
+        # Classement : score décroissant, puis le plus rapide
+        classement = sorted(self.joueurs.values(), key=lambda j: (-j.score, j.termine_a))
+        return {
+            "type": "fin",
+            "classement": [
+                {"joueur": j.nom, "score": j.score, "duree_s": round(j.termine_a - self.debut, 2)}
+                for j in classement
+            ],
+            "gagnant": classement[0].nom if len(classement) < 2 or classement[0].score > classement[1].score else None
+        }
+
+
+# Salles de ce worker : session_id -> DuelRoom. Une salle survit à la déconnexion de
+# tous ses joueurs (scores et progression conservés pour la reprise) jusqu'à
+# l'expiration de sa session.
+salles: Dict[str, DuelRoom] = {}
+
+
+def purger_salles():
+    """Retire les salles dont la session a expiré et où plus personne n'est connecté."""
+    now = time.time()
+    for session_id, salle in list(salles.items()):
+        if salle.expires_at < now and not salle.connectes():
+            del salles[session_id]
+
+
+async def recevoir(websocket: WebSocket) -> Any:
+    """Message JSON du client ; ValueError pour une trame binaire ou un JSON invalide."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    texte = message.get("text")
+    if texte is None:
+        raise ValueError("trame binaire")
+    return json.loads(texte)
+
+
+@router.websocket("/duel/ws/{session_id}")
+async def duel_temps_reel(websocket: WebSocket, session_id: str, joueur: str = Query(..., min_length=1)):
+    """
+    Canal temps réel d'un duel.
+
+    La salle vit en mémoire du worker qui l'a ouverte, enregistré comme propriétaire
+    de la session (DUEL_STORE=sqlite pour plusieurs workers). Une connexion arrivée sur
+    un autre worker est fermée avec le code 4421 : avec plusieurs workers, le proxy doit
+    router /duel/ws/{session_id} de façon collante (hachage sur le chemin).
+
+    Serveur -> client : joueurs, attente, debut, question, resultat, progression, termine, fin, erreur
+    Client -> serveur : {"type": "reponse", "index": n, "reponse": ...}
+    """
+    await websocket.accept()
+
+    salle = salles.get(session_id)
+    if salle is None:
+        purger_salles()
+        session = await run_in_threadpool(duel_store.get, session_id)
+        proprietaire = await run_in_threadpool(reserver_salle, session_id) if session else None
+        if proprietaire is None:
+            await websocket.close(code=4404, reason="Session de duel introuvable ou expirée.")
+            return
+        if proprietaire != WORKER_ID:
+            await websocket.close(code=CODE_AUTRE_WORKER,
+                                  reason="Salle ouverte sur un autre worker : routage collant requis.")
+            return
+        salle = salles.setdefault(session_id, DuelRoom(session))
+
+    if not salle.peut_rejoindre(joueur):
+        await websocket.close(code=4409, reason="Salle pleine ou joueur déjà connecté.")
+        return
+
+    moi = salle.joueurs.setdefault(joueur, Joueur(joueur))
+    moi.socket = websocket
+    await salle.diffuser_joueurs()
+
+    if salle.debut is not None:
+        await salle.envoyer_question(moi)
+    elif len(salle.joueurs) >= DUEL_WS_MAX_JOUEURS:
+        await salle.demarrer()
+    else:
+        await salle.envoyer(moi, {"type": "attente", "joueurs_attendus": DUEL_WS_MAX_JOUEURS - len(salle.joueurs)})
+
+    try:
+        while True:
+            try:
+                message = await recevoir(websocket)
+            except ValueError:
+                await salle.envoyer(moi, {"type": "erreur", "detail": "Message JSON texte attendu."})
+                continue
+            if isinstance(message, dict) and message.get("type") == "reponse":
+                await salle.repondre(moi, message)
+            else:
+                await salle.envoyer(moi, {"type": "erreur", "detail": "Type de message inconnu."})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if moi.socket is websocket:
+            moi.socket = None
+        if salle.connectes():
+            await salle.diffuser_joueurs()
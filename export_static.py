@@ -0,0 +1,148 @@
+# export_static.py
+"""
+Exporte tous les chapitres et versets en fichiers JSON statiques, au même format
+que l'API, pour que le CDN / nginx serve /passage et /verser sans Python :
+
+    <sortie>/<lang>/passage/<livre>/<chapitre>.json        (= GET /passage?ref=Livre C)
+    <sortie>/<lang>/passage/<livre>/<chapitre>.json.gz|.br (versions pré-compressées)
+    <sortie>/<lang>/verser/<livre>/<chapitre>/<verset>.json (= GET /verser?ref=Livre C:V)
+    <sortie>/manifest.json                                 (livres -> slugs, empreintes)
+
+L'export est incrémental (seuls les fichiers modifiés sont réécrits, les fichiers
+obsolètes sont supprimés) et les livres sont traités en parallèle.
+
+Usage : python export_static.py --sortie static --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from bible_loader import BibleLoader, BibleSnapshot
+from fast_json import dumps
+
+EXTENSIONS_COMPRESSION = {"gzip": ".gz", "br": ".br"}
+
+
+def slugify(book_name: str) -> str:
+    """'1 Jean' -> '1-jean', 'Genèse' -> 'genese'."""
+    ascii_name = unicodedata.normalize("NFKD", book_name).encode("ascii", "ignore").decode()
+    return "-".join(ascii_name.lower().split())
+
+
+def empreinte(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def ecrire_si_modifie(sortie: str, chemin: str, data: bytes, anciennes: Dict[str, str], force: bool) -> Tuple[str, bool]:
+    """Écrit le fichier seulement si son contenu a changé ; retourne (empreinte, écrit)."""
+    h = empreinte(data)
+    complet = os.path.join(sortie, chemin)
+    if not force and anciennes.get(chemin) == h and os.path.exists(complet):
+        return h, False
+    os.makedirs(os.path.dirname(complet), exist_ok=True)
+    tmp = complet + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, complet)
+    return h, True
+
+
+def exporter_livre(snapshot: BibleSnapshot, lang: str, book_num: int, slug: str,
+                   sortie: str, anciennes: Dict[str, str], force: bool) -> Tuple[Dict[str, str], int]:
+    """Exporte les chapitres et versets d'un livre ; retourne (empreintes, nb fichiers écrits)."""
+    fichiers, ecrits = {}, 0
+    versets = snapshot.bibles[lang]
+    aligned = snapshot.aligned[lang]
+
+    for (num, chapter), (start, end) in snapshot.chapter_spans.items():
+        if num != book_num:
+            continue
+
+        payloads = snapshot.chapter_payloads[lang].get((num, chapter))
+        if payloads is None:
+            continue
+
+        base = f"{lang}/passage/{slug}/{chapter}.json"
+        sorties = [(base, payloads["identity"])]
+        sorties += [(base + ext, payloads[enc]) for enc, ext in EXTENSIONS_COMPRESSION.items() if enc in payloads]
+
+        for pos in aligned[start:end]:
+            if pos < 0:
+                continue
+            v = versets[pos]
+            sorties.append((f"{lang}/verser/{slug}/{chapter}/{v['verse']}.json", dumps({"text": v.get("text", "")})))
+
+        for chemin, data in sorties:
+            fichiers[chemin], ecrit = ecrire_si_modifie(sortie, chemin, data, anciennes, force)
+            ecrits += ecrit
+
+    return fichiers, ecrits
+
+
+def exporter(sortie: str, langues: List[str] = None, workers: int = 8, force: bool = False):
+    start = time.perf_counter()
+    snapshot = BibleLoader().snapshot
+    langues = [lang for lang in (langues or list(snapshot.bibles)) if snapshot.bibles.get(lang)]
+
+    chemin_manifest = os.path.join(sortie, "manifest.json")
+    anciennes: Dict[str, str] = {}
+    if os.path.exists(chemin_manifest):
+        with open(chemin_manifest, "r", encoding="utf-8") as f:
+            ancien = json.load(f)
+        anciennes = ancien.get("files", {})
+
+    manifest = {"version": snapshot.version, "generated_at": int(time.time()), "languages": {}, "files": {}}
+    taches = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for lang in langues:
+            livres = {}
+            for book_num, book_name in snapshot.book_names[lang].items():
+                slug = slugify(book_name)
+                if slug in livres.values():
+                    slug = f"{slug}-{book_num}"
+                livres[book_name] = slug
+                taches.append(pool.submit(exporter_livre, snapshot, lang, book_num, slug, sortie, anciennes, force))
+            manifest["languages"][lang] = {"books": livres, "verses": len(snapshot.bibles[lang])}
+
+        ecrits = 0
+        for tache in taches:
+            fichiers, n = tache.result()
+            manifest["files"].update(fichiers)
+            ecrits += n
+
+    # Supprimer les fichiers qui n'existent plus dans la nouvelle exportation
+    obsoletes = [chemin for chemin in anciennes if chemin not in manifest["files"]]
+    for chemin in obsoletes:
+        try:
+            os.remove(os.path.join(sortie, chemin))
+        except FileNotFoundError:
+            pass
+
+    os.makedirs(sortie, exist_ok=True)
+    with open(chemin_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    print(f"\n✅ Export terminé en {time.perf_counter() - start:.1f}s : "
+          f"{len(manifest['files'])} fichiers, {ecrits} écrits, {len(obsoletes)} supprimés")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporte la Bible en fichiers JSON statiques.")
+    parser.add_argument("--sortie", default="static", help="Dossier de sortie (défaut: static)")
+    parser.add_argument("--langues", default=None, help="Langues à exporter, ex: fr,en (défaut: toutes)")
+    parser.add_argument("--workers", type=int, default=8, help="Nombre de livres traités en parallèle")
+    parser.add_argument("--force", action="store_true", help="Réécrire tous les fichiers")
+    args = parser.parse_args()
+
+    exporter(
+        args.sortie,
+        [l.strip() for l in args.langues.split(",")] if args.langues else None,
+        args.workers,
+        args.force
+    )
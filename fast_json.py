@@ -0,0 +1,32 @@
+import json
+from typing import Any
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson absent : repli sur le module json standard
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Sérialise en JSON UTF-8 (orjson si disponible)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Désérialise du JSON UTF-8 (orjson si disponible)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(Response):
+    """Réponse JSON sérialisée avec dumps() ; accepte aussi des octets déjà encodés."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -2,19 +2,47 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 import json
 import random
-import string
 from typing import List, Optional
 import os
 import requests
 import re
 from dotenv import load_dotenv
 from bible_loader import bible_loader
+from fast_json import FastJSONResponse, dumps
+from learner_store import learner_store
+from admission import CircuitBreaker
+from compression import choose_encoding
+from text_utils import normalize_text
+from caches import LRUCache, memoize_seeded, seeded_rng
+from popularity import popularity_log
+from prefetch import prefetched
+from recitation import aligner
+import distractors  # noqa: F401  (déclare l'index "distracteurs")
+import local_distractors  # noqa: F401  (déclare l'index "modele_distracteurs")
 
 load_dotenv()
 
-# --- Configuration de l'IA ---
+# --- Configuration des distracteurs ---
+# "local" : modèle entraîné sur le corpus (défaut) ; "together" : IA distante
+DISTRACTOR_BACKEND = os.environ.get("DISTRACTOR_BACKEND", "local").lower()
 TOGETHER_API_KEY = os.environ.get("TOGETHER_API_KEY")
-API_URL = "https://api.together.xyz/v1/chat/completions"
+API_URL = os.environ.get("TOGETHER_API_URL", "https://api.together.xyz/v1/chat/completions")
+IA_TIMEOUT = float(os.environ.get("IA_TIMEOUT", "10"))
+BULK_MAX_REFERENCES = int(os.environ.get("BULK_MAX_REFERENCES", "200"))
+RECITATION_MAX_MOTS = int(os.environ.get("RECITATION_MAX_MOTS", "5000"))
+
+# Passages hors chapitre entier (par version et plage canonique) et distracteurs de l'IA distante
+passage_cache = LRUCache("passages", int(os.environ.get("PASSAGE_CACHE_SIZE", "512")))
+distractor_cache = LRUCache("distracteurs", int(os.environ.get("DISTRACTOR_CACHE_SIZE", "4096")))
+# Taille maximale d'un passage mémorisé (les livres entiers sont assemblés à chaque fois)
+PASSAGE_CACHE_MAX_OCTETS = int(os.environ.get("PASSAGE_CACHE_MAX_OCTETS", "65536"))
+
+# Après plusieurs échecs ou timeouts, l'IA est court-circuitée au profit des distracteurs locaux
+ia_breaker = CircuitBreaker(
+    "together",
+    failure_threshold=int(os.environ.get("IA_BREAKER_FAILURES", "3")),
+    reset_timeout=float(os.environ.get("IA_BREAKER_RESET", "30"))
+)
 
 router = APIRouter()
 
@@ -38,6 +66,10 @@ class ReferenceRequest(BaseModel):
     reference: str
     niveau: str
     mots_deja_utilises: Optional[List[str]] = None
+    learner_id: Optional[str] = None
+    seed: Optional[int] = None
+    # Identifiant de partie : les questions suivantes sont pré-générées (/jeu, /qcm)
+    session_id: Optional[str] = None
 
 class RandomQcmRequest(BaseModel):
     mots_deja_utilises: Optional[List[str]] = None
@@ -59,9 +91,20 @@ class ReferenceQuestionRequest(BaseModel):
     source_group: Optional[str] = None
     source_refs: Optional[List[str]] = None
     source_book: Optional[str] = None
+    seed: Optional[int] = None
 
 class RemettreEnOrdreRequest(BaseModel):
     reference: str
+    seed: Optional[int] = None
+
+class BulkPassageRequest(BaseModel):
+    references: List[str]
+
+class RecitationRequest(BaseModel):
+    reference: str
+    texte: str
+    # Récitation en cours : les mots pas encore atteints ne sont pas comptés comme manquants
+    partiel: bool = False
 
 # Dictionnaire des catégories de livres
 # Dictionnaire des catégories de livres - VERSION BILINGUE
@@ -176,21 +219,6 @@ def get_books_for_category(category: str, language: str = "fr") -> List[str]:
 # books_en = get_books_for_category("evangiles", "en")
 # # ["Matthew", "Mark", "Luke", "John"]
 
-def normalize_text(s: str) -> str:
-    """Met en minuscule, retire les accents et la ponctuation."""
-    s = s.lower().strip()
-    replacements = (
-        ("á", "a"), ("à", "a"), ("â", "a"), ("ä", "a"),
-        ("é", "e"), ("è", "e"), ("ê", "e"), ("ë", "e"),
-        ("í", "i"), ("î", "i"), ("ï", "i"),
-        ("ó", "o"), ("ô", "o"), ("ö", "o"),
-        ("ú", "u"), ("ù", "u"), ("û", "u"), ("ü", "u"),
-        ("ç", "c"),
-    )
-    for a, b in replacements:
-        s = s.replace(a, b)
-    return s.translate(str.maketrans('', '', string.punctuation))
-
 def levenshtein_distance(s1: str, s2: str) -> int:
     """Calcule la distance de Levenshtein entre deux chaînes."""
     if len(s1) < len(s2):
@@ -223,56 +251,105 @@ def are_strings_similar(s1: str, s2: str, tolerance: float = 0.85) -> bool:
     
     return similarity >= tolerance
 
-def generer_mots_ia(contexte_pour_ia, mot_correct, livre):
-    """Génère des mots distracteurs avec l'IA ou utilise un fallback."""
-    try:
-        if not TOGETHER_API_KEY:
-            raise Exception("Clé API manquante")
-            
-        headers = {"Authorization": f"Bearer {TOGETHER_API_KEY}"}
-        
-        prompt = f"""
-        Contexte biblique : "{contexte_pour_ia}" (du livre {livre})
-        
-        Le mot manquant est "{mot_correct}".
-        
-        Génère exactement 3 mots distracteurs bibliques qui :
-        1. Sont plausibles dans ce contexte
-        2. Sont différents de "{mot_correct}"
-        3. Sont des mots français courants dans la Bible
-        
-        Réponds uniquement avec les 3 mots, séparés par des virgules.
-        """
-        
-        data = {
-            "model": "meta-llama/Llama-2-7b-chat-hf",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 50,
-            "temperature": 0.7
-        }
-        
-        response = requests.post(API_URL, json=data, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            mots = [mot.strip() for mot in content.split(",")]
-            if len(mots) >= 3:
-                return mots[:3]
-        
-        raise Exception("Réponse IA invalide")
+def appeler_ia_distracteurs(contexte_pour_ia, mot_correct, livre) -> List[str]:
+    """Demande 3 mots distracteurs à l'IA ; lève une exception en cas d'échec."""
+    if not TOGETHER_API_KEY:
+        raise Exception("Clé API manquante")
         
+    headers = {"Authorization": f"Bearer {TOGETHER_API_KEY}"}
+    
+    prompt = f"""
+    Contexte biblique : "{contexte_pour_ia}" (du livre {livre})
+    
+    Le mot manquant est "{mot_correct}".
+    
+    Génère exactement 3 mots distracteurs bibliques qui :
+    1. Sont plausibles dans ce contexte
+    2. Sont différents de "{mot_correct}"
+    3. Sont des mots français courants dans la Bible
+    
+    Réponds uniquement avec les 3 mots, séparés par des virgules.
+    """
+    
+    data = {
+        "model": "meta-llama/Llama-2-7b-chat-hf",
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": 50,
+        "temperature": 0.7
+    }
+    
+    response = requests.post(API_URL, json=data, headers=headers, timeout=IA_TIMEOUT)
+    
+    if response.status_code == 200:
+        result = response.json()
+        content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+        mots = [mot.strip() for mot in content.split(",")]
+        if len(mots) >= 3:
+            return mots[:3]
+    
+    raise Exception("Réponse IA invalide")
+
+def distracteurs_locaux(mot_correct: str, language: str = "fr", livre: Optional[str] = None, rng=random) -> List[str]:
+    """Tire 3 mots distracteurs au même profil que le mot correct (sans appel réseau)."""
+    cible = normalize_text(mot_correct)
+    index = bible_loader.get_index("distracteurs", language)
+    mots = index.sample(mot_correct, 3, rng, book=bible_loader.snapshot.book_number(livre) if livre else None)
+    
+    fallback = ["love", "peace", "faith"] if language == "en" else ["amour", "paix", "joie"]
+    for mot in fallback:
+        if len(mots) >= 3:
+            break
+        if mot not in mots and mot != cible:
+            mots.append(mot)
+    return mots[:3]
+
+def distracteurs_ia(contexte_pour_ia, mot_correct, livre, language: str = "fr") -> Optional[List[str]]:
+    """Distracteurs de l'IA distante, mémorisés par mot et par livre ; None si l'IA est indisponible."""
+    key = (language, normalize_text(mot_correct), livre)
+    mots = distractor_cache.get(key)
+    if mots is not None:
+        return list(mots)
+    if not ia_breaker.allow():
+        return None
+    try:
+        mots = appeler_ia_distracteurs(contexte_pour_ia, mot_correct, livre)
+        ia_breaker.record_success()
+        distractor_cache.put(key, tuple(mots))
+        return mots
     except Exception as e:
         print(f"Erreur IA: {e}")
-        return ["amour", "paix", "joie"]
+        ia_breaker.record_failure()
+        return None
+
+def generer_mots_ia(contexte_pour_ia, mot_correct, livre, language: str = "fr", rng=random):
+    """
+    Génère des mots distracteurs avec le modèle local (ou l'IA distante si
+    DISTRACTOR_BACKEND=together), sinon utilise le fallback par profil.
+    Retourne (mots, degrade) : degrade est vrai si le fallback a été utilisé.
+    """
+    if DISTRACTOR_BACKEND == "local":
+        modele = bible_loader.get_index("modele_distracteurs", language)
+        mots = modele.suggest(mot_correct, contexte_pour_ia.split(), 3, rng)
+        if len(mots) >= 3:
+            return mots, False
+    else:
+        popularity_log.enregistrer("distracteurs", language, mot_correct, livre)
+        mots = distracteurs_ia(contexte_pour_ia, mot_correct, livre, language)
+        if mots is not None:
+            return mots, False
+    
+    return distracteurs_locaux(mot_correct, language, livre, rng), True
 
 # ============================================
 # ROUTES DE L'API
 # ============================================
 
 @router.post("/jeu")
+@memoize_seeded
+@prefetched
 def jeu_texte_a_trous(data: ReferenceRequest, request: Request):
     """Jeu de texte à trous avec support multilingue."""
+    rng = seeded_rng(data.seed)
     try:
         versets_selectionnes = parse_and_fetch_verses(data.reference, request)
         
@@ -283,7 +360,7 @@ def jeu_texte_a_trous(data: ReferenceRequest, request: Request):
         passage_pour_jeu = []
         
         if nombre_de_versets > 3:
-            passage_pour_jeu = [random.choice(versets_selectionnes)]
+            passage_pour_jeu = [rng.choice(versets_selectionnes)]
         else:
             passage_pour_jeu = versets_selectionnes
         
@@ -308,7 +385,7 @@ def jeu_texte_a_trous(data: ReferenceRequest, request: Request):
         if not indices_disponibles:
             return {"error": "Le passage est trop court."}
         
-        random.shuffle(indices_disponibles)
+        rng.shuffle(indices_disponibles)
         indices_choisis = sorted(indices_disponibles[:nb_mots])
         
         reponses = [re.sub(r'[^\w\s-]', '', mots[i]) for i in indices_choisis]
@@ -338,32 +415,119 @@ def verifier_reponses(data: VerificationRequest):
     
     return {"resultats": resultats}
 
+@router.post("/reciter")
+def reciter_passage(data: RecitationRequest, request: Request):
+    """Note la récitation d'un passage entier, mot à mot (correct, mal orthographié, manquant, en trop)."""
+    versets = parse_and_fetch_verses(data.reference, request)
+    mots_reference = " ".join(v["text"] for v in versets).split()
+    mots_saisis = data.texte.split()
+    
+    if max(len(mots_reference), len(mots_saisis)) > RECITATION_MAX_MOTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Passage ou texte trop long (maximum {RECITATION_MAX_MOTS} mots)."
+        )
+    
+    return {"reference": data.reference, **aligner(mots_reference, mots_saisis, data.partiel)}
+
+def passage_json(reference: str, language: str = "fr") -> Optional[bytes]:
+    """JSON d'un passage (fragments pré-encodés), mémorisé par version et plage canonique."""
+    spans = bible_loader.resolve_reference(reference)
+    if not spans:
+        return None
+    key = (bible_loader.version, language, tuple((s.start, s.stop) for s in spans))
+    contenu = passage_cache.get(key)
+    if contenu is None:
+        contenu = bible_loader.get_passage_json(reference, language)
+        if contenu is not None and len(contenu) <= PASSAGE_CACHE_MAX_OCTETS:
+            passage_cache.put(key, contenu)
+    return contenu
+
 @router.get("/passage")
 def get_passage(ref: str = Query(...), request: Request = None):
-    """Récupère un passage avec support multilingue."""
+    """Récupère un passage avec support multilingue (fragments JSON pré-encodés)."""
     try:
-        versets = parse_and_fetch_verses(ref, request)
+        language = getattr(request.state, "language", "fr")
+        popularity_log.enregistrer_reference("passage", language, ref)
         
-        if not versets:
-            return []
+        # Chapitre entier : réponse pré-compressée, négociée selon Accept-Encoding
+        payloads = bible_loader.get_chapter_payloads(ref, language)
+        if payloads is not None:
+            encoding = choose_encoding(request.headers.get("accept-encoding"), payloads)
+            headers = {"Vary": "Accept-Encoding"}
+            if encoding != "identity":
+                headers["Content-Encoding"] = encoding
+            return FastJSONResponse(payloads[encoding], headers=headers)
         
-        versets.sort(key=lambda v: int(v.get('verse', 0)))
+        contenu = passage_json(ref, language)
         
-        return [
-            {
-                "reference": f"{v['book_name']} {v['chapter']}:{v['verse']}",
-                "text": v['text']
-            }
-            for v in versets
-        ]
+        if contenu is None:
+            print(f"⚠️  Passage '{ref}' non trouvé en {language}")
+            return []
+        
+        return FastJSONResponse(contenu)
         
     except Exception as e:
         print(f"Error in /passage: {e}")
         return []
 
+@router.post("/passage/bulk")
+def get_passages_bulk(data: BulkPassageRequest, request: Request):
+    """
+    Récupère plusieurs passages en un seul appel (plans de lecture, listes de mémorisation).
+    Les résultats sont indexés par référence d'entrée ; une référence invalide
+    produit une erreur sur son entrée sans faire échouer le lot.
+    """
+    if not data.references:
+        raise HTTPException(status_code=400, detail="La liste de références est vide.")
+    if len(data.references) > BULK_MAX_REFERENCES:
+        raise HTTPException(status_code=400, detail=f"Le nombre maximum de références est {BULK_MAX_REFERENCES}")
+    
+    language = getattr(request.state, "language", "fr")
+    resultats = bible_loader.get_passages_json(data.references, language)
+    
+    # Assemblage direct des fragments JSON pré-encodés
+    parts = []
+    for reference, contenu in resultats.items():
+        if isinstance(contenu, bytes):
+            valeur = b'{"versets":' + contenu + b'}'
+        else:
+            valeur = dumps({"erreur": contenu})
+        parts.append(dumps(reference) + b":" + valeur)
+    
+    return FastJSONResponse(b'{"resultats":{' + b",".join(parts) + b"}}")
+
+@router.get("/passage/parallele")
+def get_passage_parallele(ref: str = Query(...), langues: Optional[str] = Query(None)):
+    """Récupère un passage dans plusieurs traductions côte à côte (ex: langues=fr,en)."""
+    languages = [l.strip() for l in langues.split(",") if l.strip()] if langues else None
+    lignes = bible_loader.get_parallel(ref, languages)
+
+    if not lignes:
+        raise HTTPException(status_code=404, detail=f"Passage '{ref}' non trouvé.")
+
+    return [
+        {
+            "verse_id": [ligne["book"], ligne["chapter"], ligne["verse"]],
+            "textes": {
+                lang: (
+                    {
+                        "reference": f"{v['book_name']} {v['chapter']}:{v['verse']}",
+                        "text": v['text']
+                    } if v is not None else None
+                )
+                for lang, v in ligne["textes"].items()
+            }
+        }
+        for ligne in lignes
+    ]
+
 @router.post("/qcm")
+@memoize_seeded
+@prefetched
 def jeu_qcm(data: ReferenceRequest, request: Request):
     """Génère une question QCM avec support multilingue complet."""
+    rng = seeded_rng(data.seed)
     try:
         language = getattr(request.state, "language", "fr")
         print(f"🎮 /qcm appelé avec language={language}, reference={data.reference}")
@@ -374,17 +538,23 @@ def jeu_qcm(data: ReferenceRequest, request: Request):
         if not versets_selectionnes:
             return {"error": "Aucun verset trouvé pour cette référence."}
         
-        verset_question = random.choice(versets_selectionnes)
+        verset_question = rng.choice(versets_selectionnes)
         
         mots_utilises = {normalize_text(mot) for mot in (data.mots_deja_utilises or [])}
         
         mots = verset_question["text"].split()
         
         mots_eligibles = {normalize_text(mot) for mot in mots if len(mot) > 3}
-        mots_non_utilises = list(mots_eligibles - mots_utilises)
+        # Listes triées : le tirage dépend de la graine, pas de l'ordre des ensembles
+        mots_non_utilises = sorted(mots_eligibles - mots_utilises)
+        
+        # Profil serveur : les mots appris ne sont plus renvoyés par le client
+        if data.learner_id:
+            est_appris = learner_store.learned_checker(data.learner_id, language)
+            mots_non_utilises = [mot for mot in mots_non_utilises if not est_appris(mot)]
         
         if not mots_non_utilises and mots_eligibles:
-            mots_non_utilises = list(mots_eligibles)
+            mots_non_utilises = sorted(mots_eligibles)
         
         if not mots_non_utilises:
             message = {
@@ -393,7 +563,7 @@ def jeu_qcm(data: ReferenceRequest, request: Request):
             }
             return {"error": message.get(language, message["fr"])}
 
-        mot_correct = random.choice(mots_non_utilises)
+        mot_correct = rng.choice(mots_non_utilises)
         mot_a_retirer = next((mot for mot in mots if normalize_text(mot) == mot_correct), mot_correct)
 
         # ✅ NOUVEAU : Générer distracteurs selon la langue
@@ -409,40 +579,25 @@ def jeu_qcm(data: ReferenceRequest, request: Request):
                 "en": ["love", "faith", "hope", "grace", "peace", "truth", "light", "life", "word", "spirit"],
                 "fr": ["amour", "foi", "espérance", "grâce", "paix", "vérité", "lumière", "vie", "parole", "esprit"]
             }
-            mauvais_mots = set(random.sample(fallback_words.get(language, fallback_words["fr"]), 3))
+            mauvais_mots = set(rng.sample(fallback_words.get(language, fallback_words["fr"]), 3))
         else:
-            # Générer des distracteurs intelligents selon le niveau
-            if data.niveau == "facile":
-                # Facile : mots d'autres livres
-                pool = [v for v in versets_all if v.get("book_name") != verset_question.get("book_name")]
-            elif data.niveau == "difficile":
-                # Difficile : mots du même chapitre
-                pool = [v for v in versets_all 
-                       if v.get("book_name") == verset_question.get("book_name") 
-                       and v.get("chapter") == verset_question.get("chapter")]
-            else:
-                # Moyen : mots du même livre
-                pool = [v for v in versets_all if v.get("book_name") == verset_question.get("book_name")]
-
-            random.shuffle(pool)
-            
-            # Extraire des mots distracteurs
-            while len(mauvais_mots) < 3 and pool:
-                mots_option = pool.pop()['text'].split()
-                mots_propres = {normalize_text(m) for m in mots_option if len(m) > 3}
-                mots_propres.discard(mot_correct.lower())
-                if mots_propres:
-                    mauvais_mots.add(random.choice(list(mots_propres)))
+            # Distracteurs au même profil (longueur, fréquence) que le mot correct :
+            # Facile : mots absents du livre ; Moyen : même livre ; Difficile : même chapitre
+            index = bible_loader.get_index("distracteurs", language)
+            livre = bible_loader.snapshot.book_number(verset_question.get("book_name", ""))
+            mauvais_mots = set(index.sample_for_level(
+                mot_correct, data.niveau, 3, rng, book=livre, chapter=verset_question.get("chapter")
+            ))
 
             # Si pas assez de distracteurs, utiliser fallback
             while len(mauvais_mots) < 3:
                 fallback = ["love", "peace", "faith"] if language == "en" else ["amour", "paix", "joie"]
-                mauvais_mots.add(random.choice(fallback))
+                mauvais_mots.add(rng.choice(fallback))
 
         # Créer la question avec le mot manquant
         question = verset_question["text"].replace(mot_a_retirer, "_____", 1)
-        options = list(mauvais_mots) + [mot_correct]
-        random.shuffle(options)
+        options = sorted(mauvais_mots) + [mot_correct]
+        rng.shuffle(options)
         
         verset_ref = f"{verset_question.get('book_name')} {verset_question.get('chapter')}:{verset_question.get('verse')}"
 
@@ -478,8 +633,10 @@ def get_single_verse(ref: str = Query(...), request: Request = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generer-question-reference")
+@memoize_seeded
 def generate_reference_question(request_data: ReferenceQuestionRequest, request: Request):
     """Génère une question de référence avec support multilingue complet."""
+    rng = seeded_rng(request_data.seed)
     language = getattr(request.state, "language", "fr")
     print(f"🎯 /generer-question-reference appelé avec language={language}")
     
@@ -532,7 +689,7 @@ def generate_reference_question(request_data: ReferenceQuestionRequest, request:
         raise HTTPException(status_code=400, detail=error_msg.get(language, error_msg["fr"]))
 
     # ✅ Choisir un verset aléatoire
-    verset_correct = random.choice(pool_source)
+    verset_correct = rng.choice(pool_source)
     texte_de_la_question = verset_correct.get("text", "")
     
     options = set()
@@ -560,9 +717,9 @@ def generate_reference_question(request_data: ReferenceQuestionRequest, request:
             }
             
             if len(pool_pertinent) >= 2: 
-                options.update(random.sample(list(pool_pertinent), 2))
+                options.update(rng.sample(sorted(pool_pertinent), 2))
             if len(options) < 4 and pool_general: 
-                options.add(random.choice(list(pool_general)))
+                options.add(rng.choice(sorted(pool_general)))
                 
         else:  # Moyen ou Difficile
             # Livre + Chapitre + Verset
@@ -571,7 +728,7 @@ def generate_reference_question(request_data: ReferenceQuestionRequest, request:
             
             pool_distracteurs = [v for v in pool_source if v != verset_correct]
             if len(pool_distracteurs) >= 3:
-                for d in random.sample(pool_distracteurs, 3):
+                for d in rng.sample(pool_distracteurs, 3):
                     options.add(f"{d.get('book_name')} {d.get('chapter')}:{d.get('verse')}")
     else:
         if request_data.difficulty == "facile":
@@ -592,9 +749,9 @@ def generate_reference_question(request_data: ReferenceQuestionRequest, request:
             }
             
             if len(pool_pertinent) >= 2: 
-                options.update(random.sample(list(pool_pertinent), 2))
+                options.update(rng.sample(sorted(pool_pertinent), 2))
             if len(options) < 4 and pool_general: 
-                options.add(random.choice(list(pool_general)))
+                options.add(rng.choice(sorted(pool_general)))
                 
         elif request_data.difficulty == "moyen":
             # Moyen : Livre + Chapitre
@@ -607,7 +764,7 @@ def generate_reference_question(request_data: ReferenceQuestionRequest, request:
             ]
             
             while len(options) < 4 and pool_distracteurs:
-                d = random.choice(pool_distracteurs)
+                d = rng.choice(pool_distracteurs)
                 options.add(f"{d.get('book_name')} {d.get('chapter')}")
                 pool_distracteurs.remove(d)
                 
@@ -618,20 +775,20 @@ def generate_reference_question(request_data: ReferenceQuestionRequest, request:
             
             distracteurs_pool = [v for v in pool_source if v != verset_correct]
             if len(distracteurs_pool) >= 3:
-                for d in random.sample(distracteurs_pool, 3):
+                for d in rng.sample(distracteurs_pool, 3):
                     options.add(f"{d.get('book_name')} {d.get('chapter')}:{d.get('verse')}")
 
     # ✅ Compléter avec des distracteurs aléatoires si nécessaire
-    options_list = list(options)
+    options_list = sorted(options)
     tentatives = 0
     while len(options_list) < 4 and tentatives < 10:
-        d = random.choice(versets)
+        d = rng.choice(versets)
         new_option = f"{d.get('book_name')} {d.get('chapter')}:{d.get('verse')}"
         if new_option not in options_list:
             options_list.append(new_option)
         tentatives += 1
     
-    random.shuffle(options_list)
+    rng.shuffle(options_list)
 
     print(f"✅ Question de référence générée en {language}")
     print(f"   Texte: {texte_de_la_question[:50]}...")
@@ -646,28 +803,33 @@ def generate_reference_question(request_data: ReferenceQuestionRequest, request:
     
 
 @router.post("/qcm/random")
+@memoize_seeded
 def jeu_qcm_aleatoire(data: ReferenceRequest, request: Request):
     """Génère une question QCM aléatoire."""
+    rng = seeded_rng(data.seed)
     language = getattr(request.state, "language", "fr")
     
-    # Cette route fonctionne uniquement en français pour l'instant
-    if language == "en":
+    # Le prompt de l'IA distante est en français ; le modèle local couvre toutes les langues
+    if language == "en" and DISTRACTOR_BACKEND != "local":
         return {"error": "Cette fonctionnalité n'est disponible qu'en français pour le moment."}
     
     try:
-        versets = bible_loader.get_verses("fr")
+        versets = bible_loader.get_verses(language)
         mots_utilises = set(data.mots_deja_utilises or [])
+        est_appris = learner_store.learned_checker(data.learner_id, language) if data.learner_id else None
         
         verset_question = None
         indices_disponibles = []
         
         tentatives = 0
         while not indices_disponibles and tentatives < 50:
-            verset_question = random.choice(versets)
+            verset_question = rng.choice(versets)
             if len(verset_question["text"].split()) >= 5:
                 mots = verset_question["text"].split()
                 mots_longs_indices = [i for i, mot in enumerate(mots) if len(mot) > 3]
                 indices_disponibles = [i for i in mots_longs_indices if re.sub(r'[^\w\s-]', '', mots[i]).lower() not in mots_utilises]
+                if est_appris:
+                    indices_disponibles = [i for i in indices_disponibles if not est_appris(normalize_text(mots[i]))]
             tentatives += 1
 
         if not indices_disponibles:
@@ -676,7 +838,7 @@ def jeu_qcm_aleatoire(data: ReferenceRequest, request: Request):
         livre = verset_question.get("book_name", "Inconnu")
         mots = verset_question["text"].split()
         
-        index_mot_a_retirer = random.choice(indices_disponibles)
+        index_mot_a_retirer = rng.choice(indices_disponibles)
         mot_a_retirer = mots[index_mot_a_retirer]
         mot_correct = re.sub(r'[^\w\s-]', '', mot_a_retirer)
 
@@ -684,37 +846,40 @@ def jeu_qcm_aleatoire(data: ReferenceRequest, request: Request):
         partie_contexte = mots[debut_contexte:index_mot_a_retirer]
         contexte_pour_ia = " ".join(partie_contexte) + " _____"
 
-        mauvais_mots = generer_mots_ia(contexte_pour_ia, mot_correct, livre)
+        mauvais_mots, degrade = generer_mots_ia(contexte_pour_ia, mot_correct, livre, language, rng)
 
         question = verset_question["text"].replace(mot_a_retirer, "_____", 1)
 
         options = mauvais_mots + [mot_correct]
-        random.shuffle(options)
+        rng.shuffle(options)
 
         return {
             "question": question,
             "options": options,
-            "reponse_correcte": mot_correct
+            "reponse_correcte": mot_correct,
+            "degrade": degrade
         }
 
     except Exception as e:
         return {"error": f"Une erreur interne est survenue: {e}"}
 
 @router.post("/remettre-en-ordre")
+@memoize_seeded
 def get_unscrambled_verse_game(data: RemettreEnOrdreRequest, request: Request):
     """Jeu de remise en ordre des mots avec support multilingue."""
+    rng = seeded_rng(data.seed)
     try:
         versets_selectionnes = parse_and_fetch_verses(data.reference, request)
 
         if not versets_selectionnes:
             return {"error": "Aucun verset trouvé pour cette référence."}
 
-        verset_choisi = random.choice(versets_selectionnes)
+        verset_choisi = rng.choice(versets_selectionnes)
         texte_original = verset_choisi["text"]
         
         mots = texte_original.split()
         mots_melanges = mots.copy()
-        random.shuffle(mots_melanges)
+        rng.shuffle(mots_melanges)
         
         ref_exacte = f"{verset_choisi.get('book_name')} {verset_choisi.get('chapter')}:{verset_choisi.get('verse')}"
 
@@ -0,0 +1,371 @@
+# import_bible.py
+"""
+Importe une traduction dans le format lu par BibleLoader : {"verses": [...]} compact,
+un objet {"book_name", "chapter", "verse", "text"} par verset, dans l'ordre canonique.
+
+Formats d'entrée (détectés d'après l'extension et le contenu) :
+    - JSON imbriqué  {"books": [{"name", "chapters": [{"chapter", "verses": [{"verse", "text"}]}]}]}
+    - JSON à plat    [{"book_name", "chapter", "verse", "text"}, ...] ou {"verses": [...]}
+    - USFM           un fichier par livre (.usfm, .sfm), ou un dossier de fichiers
+    - OSIS XML       .xml / .osis (versets conteneurs ou jalons sID/eID)
+
+La lecture est incrémentale (ijson pour le JSON s'il est installé, expat pour l'OSIS,
+ligne à ligne pour l'USFM) et le fichier de sortie est écrit au fil de l'eau. Quand
+l'entrée comporte plusieurs fichiers (un par livre), ils sont convertis en parallèle ;
+un fichier unique (JSON imbriqué, OSIS) est lu par un seul processus.
+L'ordre des versets est validé : livres contigus, chapitres et versets croissants.
+
+Usage : python import_bible.py kjv_original.json --langue en
+        python import_bible.py usfm/ --sortie segond_1910.json --workers 8
+        python import_bible.py bible.osis.xml --sortie kjv.json --noms-livres noms.json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import xml.sax
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from bible_loader import BIBLE_FILES
+from fast_json import dumps
+
+try:
+    import ijson
+except ImportError:  # ijson absent : le JSON est lu d'un bloc
+    ijson = None
+
+EXTENSIONS = {".json": "json", ".usfm": "usfm", ".sfm": "usfm", ".xml": "osis", ".osis": "osis"}
+
+
+class ImportErreur(Exception):
+    pass
+
+
+def verset(book_name: str, chapter, verse, text: str) -> dict:
+    return {"book_name": book_name, "chapter": int(chapter), "verse": int(verse), "text": " ".join(text.split())}
+
+
+def _premier(d: dict, *cles, defaut=None):
+    for cle in cles:
+        if cle in d:
+            return d[cle]
+    return defaut
+
+
+# --- JSON ---
+def _json_items(path: str, prefixe: str) -> Iterator:
+    with open(path, "rb") as f:
+        yield from ijson.items(f, prefixe, use_float=True)
+
+
+def _livre_imbrique(livre: dict) -> Iterator[dict]:
+    nom = _premier(livre, "name", "book_name", "book")
+    for chapitre in livre.get("chapters", []):
+        numero = _premier(chapitre, "chapter", "number")
+        for v in chapitre.get("verses", []):
+            yield verset(nom, numero, _premier(v, "verse", "number"), v.get("text", ""))
+
+
+def _verset_plat(v: dict) -> dict:
+    return verset(_premier(v, "book_name", "book"), v["chapter"], v["verse"], v.get("text", ""))
+
+
+def lire_json(path: str, noms: Dict[str, str]) -> Iterator[dict]:
+    with open(path, "rb") as f:
+        premier = f.read(4096).lstrip()[:1]
+
+    if ijson is None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list) or "verses" in data:
+            yield from (_verset_plat(v) for v in (data if isinstance(data, list) else data["verses"]))
+        else:
+            for livre in data.get("books", []):
+                yield from _livre_imbrique(livre)
+        return
+
+    if premier == b"[":
+        yield from (_verset_plat(v) for v in _json_items(path, "item"))
+    elif _cle_racine(path) == "verses":
+        yield from (_verset_plat(v) for v in _json_items(path, "verses.item"))
+    else:
+        # Un livre à la fois en mémoire
+        for livre in _json_items(path, "books.item"):
+            yield from _livre_imbrique(livre)
+
+
+def _cle_racine(path: str) -> Optional[str]:
+    """Première clé "verses" ou "books" de l'objet racine (lecture arrêtée dès qu'elle est trouvée)."""
+    with open(path, "rb") as f:
+        for prefixe, evenement, valeur in ijson.parse(f):
+            if evenement == "map_key" and prefixe == "" and valeur in ("verses", "books"):
+                return valeur
+    return None
+
+
+# --- USFM ---
+_USFM_NOTES = re.compile(r"\\(f|fe|x|ef|ex)\s.*?\\\1\*", re.S)
+_USFM_ATTRIBUTS = re.compile(r"\|[^\\]*(?=\\\+?\w+\*)")
+# Marqueur fermant (\w*) ou ouvrant suivi de son espace (\w )
+_USFM_MARQUEURS = re.compile(r"\\\+?[a-z0-9]+(?:\*|\s?)")
+_USFM_LIGNE = re.compile(r"^\\([a-z0-9]+)\s*(.*)$")
+# \c et \v peuvent suivre un autre marqueur ou du texte sur la même ligne ("\p \v 1 ...",
+# "\q1 \v 2 ...", plusieurs versets par ligne) : chaque ligne est découpée devant eux
+_USFM_DECOUPE = re.compile(r"(?=\\[cv]\s)")
+# Marqueurs de paragraphe dont le contenu fait partie du texte des versets
+_USFM_PARAGRAPHES = {"p", "m", "pi", "pi1", "pi2", "q", "q1", "q2", "q3", "qm", "li", "li1", "li2", "nb", "pc", "b"}
+
+
+def _nettoyer_usfm(texte: str) -> str:
+    texte = _USFM_NOTES.sub("", texte)
+    texte = _USFM_ATTRIBUTS.sub("", texte)
+    return _USFM_MARQUEURS.sub("", texte)
+
+
+def lire_usfm(path: str, noms: Dict[str, str]) -> Iterator[dict]:
+    code, nom, chapitre, numero, parties = None, None, 0, None, []
+
+    def courant():
+        return verset(noms.get(code) or nom or code, chapitre, numero, _nettoyer_usfm(" ".join(parties)))
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        segments = (s.strip() for ligne in f for s in _USFM_DECOUPE.split(ligne.strip()))
+        for segment in segments:
+            m = _USFM_LIGNE.match(segment)
+            if not m:
+                if numero is not None and segment:
+                    parties.append(segment)
+                continue
+            marqueur, reste = m.groups()
+            if marqueur == "id":
+                code = reste.split()[0] if reste else None
+            elif marqueur == "h" or (marqueur in ("toc2", "toc1") and nom is None):
+                nom = reste.strip()
+            elif marqueur in ("c", "v"):
+                if numero is not None:
+                    yield courant()
+                # "\v 3 texte" ou verset groupé "\v 3-4 texte"
+                n = re.match(r"(\d+)(?:-\d+)?\s*", reste)
+                if n is None:
+                    raise ImportErreur(f"{path}: numéro invalide après \\{marqueur}: '{segment}'")
+                if marqueur == "c":
+                    chapitre, numero, parties = int(n.group(1)), None, []
+                else:
+                    numero, parties = int(n.group(1)), [reste[n.end():]]
+            elif marqueur in _USFM_PARAGRAPHES:
+                if numero is not None:
+                    parties.append(reste)
+            # Titres, sections, introductions : hors texte des versets
+    if numero is not None:
+        yield courant()
+
+
+# --- OSIS ---
+class _OsisHandler(xml.sax.ContentHandler):
+    """Accumule le texte des versets OSIS (conteneurs ou jalons), hors notes et titres."""
+
+    IGNORES = {"note", "title"}
+
+    def __init__(self, noms: Dict[str, str]):
+        super().__init__()
+        self.noms = noms
+        self.versets: List[dict] = []
+        self.courant: Optional[List[str]] = None
+        self.conteneur = False
+        self.parties: List[str] = []
+        self.ignore = 0
+
+    def _debut(self, osis_id: str):
+        livre, chapitre, numero = osis_id.split()[0].split(".")[:3]
+        self.courant = [livre, chapitre, numero]
+        self.parties = []
+
+    def _fin(self):
+        if self.courant is not None:
+            livre, chapitre, numero = self.courant
+            self.versets.append(verset(self.noms.get(livre, livre), chapitre, numero, "".join(self.parties)))
+        self.courant = None
+
+    def startElement(self, name, attrs):
+        tag = name.rsplit(":", 1)[-1]
+        if tag == "verse":
+            if "eID" in attrs:
+                self._fin()
+            elif "osisID" in attrs:
+                self._fin()
+                self._debut(attrs["osisID"])
+                self.conteneur = "sID" not in attrs
+        elif tag in self.IGNORES and self.courant is not None:
+            self.ignore += 1
+
+    def endElement(self, name):
+        tag = name.rsplit(":", 1)[-1]
+        if tag == "verse":
+            if self.conteneur:
+                self._fin()
+                self.conteneur = False
+        elif tag in self.IGNORES and self.ignore:
+            self.ignore -= 1
+
+    def characters(self, content):
+        if self.courant is not None and not self.ignore:
+            self.parties.append(content)
+
+
+def lire_osis(path: str, noms: Dict[str, str]) -> Iterator[dict]:
+    handler = _OsisHandler(noms)
+    parser = xml.sax.make_parser()
+    parser.setContentHandler(handler)
+    with open(path, "rb") as f:
+        for bloc in iter(lambda: f.read(1 << 16), b""):
+            parser.feed(bloc)
+            yield from handler.versets
+            handler.versets.clear()
+    parser.close()
+    handler._fin()  # dernier jalon sans eID
+    yield from handler.versets
+
+
+LECTEURS = {"json": lire_json, "usfm": lire_usfm, "osis": lire_osis}
+
+
+def detecter_format(path: str) -> str:
+    fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ImportErreur(f"Format non reconnu pour {path} (utilisez --format)")
+    return fmt
+
+
+def convertir_fichier(path: str, fmt: str, noms: Dict[str, str]) -> List[dict]:
+    """Convertit un fichier entier (utilisé par les workers, un fichier = un livre)."""
+    return list(LECTEURS[fmt](path, noms))
+
+
+# --- Validation et écriture ---
+class Validateur:
+    """Vérifie l'ordre : livres contigus, (chapitre, verset) strictement croissants dans un livre."""
+
+    def __init__(self, tolerant: bool):
+        self.tolerant = tolerant
+        self.livres_vus = set()
+        self.livre = None
+        self.dernier = (0, 0)
+        self.erreurs = 0
+
+    def accepter(self, v: dict) -> bool:
+        if v["book_name"] != self.livre:
+            if v["book_name"] in self.livres_vus:
+                return self._erreur(f"livre '{v['book_name']}' non contigu (déjà rencontré)")
+            self.livres_vus.add(v["book_name"])
+            self.livre, self.dernier = v["book_name"], (0, 0)
+        position = (v["chapter"], v["verse"])
+        if position <= self.dernier:
+            return self._erreur(f"{v['book_name']} {position[0]}:{position[1]} après "
+                                f"{self.dernier[0]}:{self.dernier[1]} (doublon ou désordre)")
+        self.dernier = position
+        if not v["text"]:
+            print(f"⚠️  {v['book_name']} {position[0]}:{position[1]} : texte vide")
+        return True
+
+    def _erreur(self, message: str) -> bool:
+        if not self.tolerant:
+            raise ImportErreur(message)
+        self.erreurs += 1
+        print(f"⚠️  {message}")
+        return False
+
+
+def ecrire(sortie: str, versets: Iterable[dict], validateur: Validateur) -> int:
+    """Écrit {"verses": [...]} au fil de l'eau dans un fichier temporaire, puis le substitue."""
+    tmp = sortie + ".tmp"
+    total = 0
+    try:
+        with open(tmp, "wb") as f:
+            f.write(b'{"verses":[')
+            for v in versets:
+                if not validateur.accepter(v):
+                    continue
+                if total:
+                    f.write(b",")
+                f.write(dumps(v))
+                total += 1
+            f.write(b"]}")
+        os.replace(tmp, sortie)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return total
+
+
+def sources(entrees: List[str]) -> List[str]:
+    fichiers = []
+    for entree in entrees:
+        if os.path.isdir(entree):
+            fichiers.extend(sorted(
+                os.path.join(entree, nom) for nom in os.listdir(entree)
+                if os.path.splitext(nom)[1].lower() in EXTENSIONS
+            ))
+        else:
+            fichiers.append(entree)
+    return fichiers
+
+
+def versets_paralleles(fichiers: List[str], formats: List[str], noms: Dict[str, str], workers: int) -> Iterator[dict]:
+    """Convertit les fichiers en parallèle ; les résultats sont rendus dans l'ordre des fichiers."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        en_cours = []
+        suivants = iter(zip(fichiers, formats))
+        # Fenêtre bornée : au plus 2 * workers livres convertis en mémoire
+        for path, fmt in suivants:
+            en_cours.append(executor.submit(convertir_fichier, path, fmt, noms))
+            if len(en_cours) >= 2 * workers:
+                break
+        while en_cours:
+            yield from en_cours.pop(0).result()
+            for path, fmt in suivants:
+                en_cours.append(executor.submit(convertir_fichier, path, fmt, noms))
+                break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importe une traduction au format de BibleLoader.")
+    parser.add_argument("entrees", nargs="+", help="Fichiers ou dossiers à importer (dans l'ordre des livres)")
+    parser.add_argument("--sortie", default=None, help="Fichier de sortie")
+    parser.add_argument("--langue", default=None, help=f"Écrit le fichier de cette langue ({', '.join(BIBLE_FILES)})")
+    parser.add_argument("--format", default="auto", choices=("auto", "json", "usfm", "osis"))
+    parser.add_argument("--noms-livres", default=None, help="JSON {code: nom} pour les livres USFM / OSIS")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processus de conversion")
+    parser.add_argument("--tolerant", action="store_true", help="Ignore les versets en désordre au lieu d'échouer")
+    args = parser.parse_args()
+
+    sortie = args.sortie or BIBLE_FILES.get(args.langue or "")
+    if not sortie:
+        parser.error("--sortie ou --langue est requis")
+
+    noms: Dict[str, str] = {}
+    if args.noms_livres:
+        with open(args.noms_livres, "r", encoding="utf-8") as f:
+            noms = json.load(f)
+
+    start = time.perf_counter()
+    try:
+        fichiers = sources(args.entrees)
+        if not fichiers:
+            raise ImportErreur("Aucun fichier à importer")
+        formats = [detecter_format(p) if args.format == "auto" else args.format for p in fichiers]
+        if len(fichiers) > 1 and args.workers > 1:
+            versets = versets_paralleles(fichiers, formats, noms, args.workers)
+        else:
+            versets = (v for path, fmt in zip(fichiers, formats) for v in LECTEURS[fmt](path, noms))
+        validateur = Validateur(args.tolerant)
+        total = ecrire(sortie, versets, validateur)
+    except (ImportErreur, OSError, ValueError, KeyError, xml.sax.SAXException) as e:
+        print(f"❌ Import échoué, aucun fichier écrit : {e}")
+        sys.exit(1)
+
+    print(f"✅ {total} versets ({len(validateur.livres_vus)} livres) écrits dans {sortie} "
+          f"en {time.perf_counter() - start:.1f}s" + (f", {validateur.erreurs} ignoré(s)" if validateur.erreurs else ""))
@@ -0,0 +1,59 @@
+import sys
+from typing import Any, Optional, Set
+
+try:
+    import resource
+except ImportError:  # resource absent (Windows)
+    resource = None
+
+# Types dont le contenu n'est pas parcouru (taille propre uniquement)
+_ATOMIC = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+def estimate_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estime la mémoire occupée par `obj` et tout ce qu'il référence (octets).
+    Les objets dont l'id est dans `seen` ne sont pas recomptés : en partageant
+    `seen` entre plusieurs appels, chaque structure n'est comptée qu'une fois.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+
+        nbytes = getattr(o, "nbytes", None)
+        if isinstance(nbytes, int):  # tableau NumPy : données + en-tête
+            total += nbytes + sys.getsizeof(o) if o.base is None else sys.getsizeof(o)
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, _ATOMIC):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__") and not isinstance(o, type):
+            stack.append(vars(o))
+    return total
+
+
+def process_rss() -> Optional[int]:
+    """Mémoire résidente du processus en octets (pic si /proc n'est pas disponible)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux : Kio ; macOS : octets
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Request
+from pydantic import BaseModel
+from typing import List
+from bible_loader import bible_loader
+from learner_store import learner_store
+from text_utils import normalize_text
+
+router = APIRouter()
+
+# --- Modèles ---
+class MotsAppris(BaseModel):
+    mots: List[str]
+
+# --- Routes ---
+@router.get("/apprenant/{learner_id}")
+def get_profil_apprenant(learner_id: str, request: Request):
+    """Retourne le nombre de mots appris par l'apprenant dans la langue courante."""
+    language = getattr(request.state, "language", "fr")
+    return {
+        "learner_id": learner_id,
+        "language": language,
+        "mots_appris": learner_store.count(learner_id, language)
+    }
+
+@router.post("/apprenant/{learner_id}/mots")
+def ajouter_mots_appris(learner_id: str, data: MotsAppris, request: Request):
+    """
+    Enregistre des mots appris ; seuls les nouveaux mots sont à envoyer.
+    Les mots absents du vocabulaire de la langue (mots du corpus, voir l'index
+    "distracteurs") sont ignorés : le vocabulaire et les bitmaps restent bornés.
+    """
+    language = getattr(request.state, "language", "fr")
+    vocabulaire = bible_loader.get_index("distracteurs", language).counts
+    mots = list(dict.fromkeys(normalize_text(mot) for mot in data.mots))
+    connus = [mot for mot in mots if mot in vocabulaire]
+    total = learner_store.mark_learned(learner_id, language, connus)
+    return {
+        "learner_id": learner_id,
+        "language": language,
+        "mots_appris": total,
+        "mots_ignores": len(mots) - len(connus)
+    }
+
+@router.delete("/apprenant/{learner_id}")
+def reinitialiser_apprenant(learner_id: str, request: Request):
+    """Efface les mots appris de l'apprenant dans la langue courante."""
+    language = getattr(request.state, "language", "fr")
+    learner_store.forget(learner_id, language)
+    return {"learner_id": learner_id, "language": language, "mots_appris": 0}
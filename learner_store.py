@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+
+class LearnerStore:
+    """
+    Profils d'apprenants stockés dans un fichier SQLite local.
+
+    Chaque mot (déjà normalisé) reçoit un identifiant stable par langue dans la table
+    `vocab` (ajout seulement), et les mots appris d'un apprenant sont un bitmap sur
+    ces identifiants. Vérifier un mot coûte une recherche + un test de bit, quelle
+    que soit la quantité de mots déjà appris.
+
+    Plusieurs workers partagent le fichier : l'attribution des identifiants et la
+    mise à jour d'un bitmap se font dans une transaction BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._vocab: Dict[str, Dict[str, int]] = {}
+        # Transactions explicites (isolation_level=None) : voir _transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vocab ("
+            "lang TEXT NOT NULL, word TEXT NOT NULL, id INTEGER NOT NULL, "
+            "PRIMARY KEY (lang, word), UNIQUE (lang, id))"
+        )
+        try:
+            # Bases créées avant la contrainte UNIQUE (lang, id)
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS vocab_lang_id ON vocab (lang, id)")
+        except sqlite3.IntegrityError:
+            print(f"⚠️  Identifiants de mots en double dans {path} : profils à réinitialiser")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS learners ("
+            "learner_id TEXT NOT NULL, lang TEXT NOT NULL, bitmap BLOB NOT NULL, "
+            "PRIMARY KEY (learner_id, lang))"
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """Transaction en écriture, verrouillée dès le début contre les autres workers."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # --- Vocabulaire ---
+    def _word_id(self, lang: str, word: str, create: bool) -> Optional[int]:
+        """Identifiant d'un mot ; avec create=True, à appeler dans une transaction."""
+        vocab = self._vocab.setdefault(lang, {})
+        word_id = vocab.get(word)
+        if word_id is not None:
+            return word_id
+
+        # Un autre worker a pu ajouter le mot entre-temps
+        row = self._conn.execute(
+            "SELECT id FROM vocab WHERE lang = ? AND word = ?", (lang, word)
+        ).fetchone()
+        if row is None:
+            if not create:
+                return None
+            next_id = self._conn.execute(
+                "SELECT COALESCE(MAX(id) + 1, 0) FROM vocab WHERE lang = ?", (lang,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO vocab (lang, word, id) VALUES (?, ?, ?)", (lang, word, next_id)
+            )
+            row = (next_id,)
+        vocab[word] = row[0]
+        return row[0]
+
+    # --- Bitmaps ---
+    def _load_bitmap(self, learner_id: str, lang: str) -> int:
+        row = self._conn.execute(
+            "SELECT bitmap FROM learners WHERE learner_id = ? AND lang = ?", (learner_id, lang)
+        ).fetchone()
+        return int.from_bytes(row[0], "little") if row else 0
+
+    def _save_bitmap(self, learner_id: str, lang: str, bitmap: int):
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO learners (learner_id, lang, bitmap) VALUES (?, ?, ?)",
+            (learner_id, lang, data),
+        )
+
+    def mark_learned(self, learner_id: str, lang: str, words: Iterable[str]) -> int:
+        """Ajoute des mots (normalisés) au profil ; retourne le nombre total de mots appris."""
+        with self._lock:
+            ajoutes: Dict[str, int] = {}
+            try:
+                with self._transaction():
+                    bitmap = self._load_bitmap(learner_id, lang)
+                    for word in words:
+                        if word:
+                            ajoutes.setdefault(word, self._word_id(lang, word, create=True))
+                            bitmap |= 1 << ajoutes[word]
+                    self._save_bitmap(learner_id, lang, bitmap)
+            except BaseException:
+                # Identifiants annulés avec la transaction : ne pas les garder en mémoire
+                vocab = self._vocab.get(lang, {})
+                for word in ajoutes:
+                    vocab.pop(word, None)
+                raise
+            return bin(bitmap).count("1")
+
+    def learned_checker(self, learner_id: str, lang: str):
+        """
+        Retourne une fonction mot -> bool qui teste le profil chargé une seule fois,
+        pour filtrer les mots d'un verset sans relire la base à chaque mot.
+        """
+        with self._lock:
+            bitmap = self._load_bitmap(learner_id, lang)
+
+        def is_learned(word: str) -> bool:
+            with self._lock:
+                word_id = self._word_id(lang, word, create=False)
+            return word_id is not None and bool(bitmap >> word_id & 1)
+
+        return is_learned
+
+    def count(self, learner_id: str, lang: str) -> int:
+        with self._lock:
+            return bin(self._load_bitmap(learner_id, lang)).count("1")
+
+    def forget(self, learner_id: str, lang: Optional[str] = None):
+        """Efface le profil d'un apprenant (une langue ou toutes)."""
+        with self._lock:
+            if lang is None:
+                self._conn.execute("DELETE FROM learners WHERE learner_id = ?", (learner_id,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM learners WHERE learner_id = ? AND lang = ?", (learner_id, lang)
+                )
+
+
+# Instance globale
+learner_store = LearnerStore(os.environ.get("LEARNER_DB_PATH", "learners.db"))
@@ -0,0 +1,244 @@
+# loadtest.py
+"""
+Test de charge de bout en bout : démarre un faux service chat-completions (latence
+configurable), lance main:app avec uvicorn contre ce service, puis simule des joueurs
+concurrents avec un mélange réaliste de routes et affiche, pour chaque palier de
+concurrence, le débit et les latences p50/p95/p99 par route.
+
+Usage : python loadtest.py --paliers 10,50,100 --duree 20 --latence-ia 0.3
+        python loadtest.py --url http://127.0.0.1:8000   (instance déjà démarrée)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from tabulate import tabulate
+
+REFERENCES = "Jean 3;Psaumes 23;Genèse 1;Romains 8;Matthieu 5:1-12"
+NIVEAUX = ("facile", "moyen", "difficile")
+
+# Mélange de trafic : (nom, poids)
+MIX = [
+    ("GET /passage", 30),
+    ("POST /qcm", 20),
+    ("POST /verifier", 15),
+    ("POST /qcm/batch", 8),
+    ("POST /generer-question-reference", 8),
+    ("POST /duel/texte-a-trous/batch", 6),
+    ("POST /duel/ordre/batch", 6),
+    ("POST /duel/session", 3),
+    ("POST /qcm/random", 4),
+]
+
+
+# --- Faux service chat-completions ---
+def demarrer_stub_ia(port: int, latence: float, gigue: float) -> ThreadingHTTPServer:
+    """Répond comme l'API chat-completions après latence ± gigue secondes."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(max(0.0, latence + random.uniform(-gigue, gigue)))
+            body = json.dumps({
+                "choices": [{"message": {"role": "assistant", "content": "amour, paix, joie"}}]
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    serveur = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    serveur.daemon_threads = True
+    threading.Thread(target=serveur.serve_forever, name="stub-ia", daemon=True).start()
+    return serveur
+
+
+# --- Application testée ---
+def demarrer_app(port: int, stub_url: str, backend: str, workers: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "TOGETHER_API_URL": stub_url,
+        "TOGETHER_API_KEY": env.get("TOGETHER_API_KEY") or "loadtest",
+        "DISTRACTOR_BACKEND": backend,
+    })
+    return subprocess.Popen(
+        # Le dossier courant reste celui des fichiers de données (BIBLE_FILES)
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", os.path.dirname(os.path.abspath(__file__)),
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,  # les print() des routes brouilleraient le rapport
+    )
+
+
+async def attendre_pret(url: str, timeout: float) -> None:
+    """Attend que /ready réponde 200 (données et index chargés, caches préchauffés)."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=2) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} n'est pas prêt après {timeout:.0f}s")
+
+
+# --- Joueurs simulés ---
+def construire_requete(route: str, rng: random.Random, references: List[str]) -> Tuple[str, str, Optional[dict]]:
+    """Retourne (méthode, chemin, corps JSON) pour une route du mélange."""
+    ref = rng.choice(references)
+    niveau = rng.choice(NIVEAUX)
+    if route == "GET /passage":
+        return "GET", f"/passage?ref={ref}", None
+    if route == "POST /verifier":
+        mots = ["amour", "lumière", "parole"]
+        return "POST", "/verifier", {"reponses_utilisateur": [rng.choice(mots) for _ in mots],
+                                     "reponses_correctes": mots}
+    if route == "POST /generer-question-reference":
+        return "POST", "/generer-question-reference", {"difficulty": niveau}
+    if route in ("POST /qcm/batch", "POST /duel/texte-a-trous/batch", "POST /duel/ordre/batch"):
+        return "POST", route.split(" ", 1)[1], {"reference": ref, "niveau": niveau, "nombre": 5}
+    if route == "POST /duel/session":
+        return "POST", "/duel/session", {"reference": ref, "niveau": niveau, "nombre": 10}
+    # /qcm, /qcm/random
+    return "POST", route.split(" ", 1)[1], {"reference": ref, "niveau": niveau}
+
+
+async def joueur(client: httpx.AsyncClient, rng: random.Random, references: List[str], fin: float,
+                 pause: float, mesures: Dict[str, List[float]], statuts: Dict[str, Dict[int, int]]) -> None:
+    routes, poids = zip(*MIX)
+    while time.monotonic() < fin:
+        route = rng.choices(routes, poids)[0]
+        methode, chemin, corps = construire_requete(route, rng, references)
+        start = time.perf_counter()
+        try:
+            response = await client.request(methode, chemin, json=corps)
+            statut = response.status_code
+        except httpx.HTTPError:
+            response, statut = None, 0
+        mesures[route].append(time.perf_counter() - start)
+        statuts[route][statut] += 1
+
+        # Un duel créé est ensuite récupéré par l'adversaire
+        if route == "POST /duel/session" and statut == 200:
+            session_id = response.json().get("session_id")
+            start = time.perf_counter()
+            try:
+                statut = (await client.get(f"/duel/session/{session_id}")).status_code
+            except httpx.HTTPError:
+                statut = 0
+            mesures["GET /duel/session/{id}"].append(time.perf_counter() - start)
+            statuts["GET /duel/session/{id}"][statut] += 1
+
+        if pause:
+            await asyncio.sleep(rng.uniform(0, 2 * pause))
+
+
+def percentile(valeurs: List[float], p: float) -> float:
+    if not valeurs:
+        return 0.0
+    return valeurs[min(len(valeurs) - 1, int(round(p / 100 * (len(valeurs) - 1))))]
+
+
+async def palier(url: str, joueurs: int, duree: float, pause: float, langue: str,
+                 references: List[str], graine: int) -> List[list]:
+    """Lance `joueurs` joueurs pendant `duree` secondes ; retourne les lignes du rapport."""
+    mesures: Dict[str, List[float]] = defaultdict(list)
+    statuts: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    limites = httpx.Limits(max_connections=joueurs, max_keepalive_connections=joueurs)
+    async with httpx.AsyncClient(base_url=url, timeout=30, limits=limites,
+                                 headers={"Accept-Language": langue}) as client:
+        fin = time.monotonic() + duree
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            joueur(client, random.Random(graine + i), references, fin, pause, mesures, statuts)
+            for i in range(joueurs)
+        ))
+        ecoule = time.perf_counter() - start
+
+    lignes = []
+    for route in sorted(mesures, key=lambda r: -len(mesures[r])):
+        valeurs = sorted(mesures[route])
+        codes = statuts[route]
+        lignes.append(ligne_rapport(route, valeurs, codes, ecoule))
+    tous = sorted(v for valeurs in mesures.values() for v in valeurs)
+    total_codes: Dict[int, int] = defaultdict(int)
+    for codes in statuts.values():
+        for code, n in codes.items():
+            total_codes[code] += n
+    lignes.append(ligne_rapport("TOTAL", tous, total_codes, ecoule))
+    return lignes
+
+
+def ligne_rapport(route: str, valeurs: List[float], codes: Dict[int, int], ecoule: float) -> list:
+    erreurs = sum(n for code, n in codes.items() if code == 0 or (code >= 400 and code != 503))
+    return [
+        route, len(valeurs), erreurs, codes.get(503, 0),
+        f"{len(valeurs) / ecoule:.1f}",
+        f"{percentile(valeurs, 50) * 1000:.1f}",
+        f"{percentile(valeurs, 95) * 1000:.1f}",
+        f"{percentile(valeurs, 99) * 1000:.1f}",
+    ]
+
+
+async def main_async(args) -> None:
+    references = [r.strip() for r in args.references.split(";") if r.strip()]
+    paliers = [int(p) for p in args.paliers.split(",")]
+    await attendre_pret(args.url, args.timeout_demarrage)
+
+    for i, joueurs in enumerate(paliers):
+        lignes = await palier(args.url, joueurs, args.duree, args.pause, args.langue, references, args.graine + 1000 * i)
+        print(f"\n📊 {joueurs} joueurs concurrents pendant {args.duree:.0f}s")
+        print(tabulate(lignes, headers=["route", "requêtes", "erreurs", "503", "req/s", "p50 ms", "p95 ms", "p99 ms"],
+                       tablefmt="github"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge de main:app avec un faux service d'IA.")
+    parser.add_argument("--url", default=None, help="Instance déjà démarrée (sinon main:app est lancé localement)")
+    parser.add_argument("--port", type=int, default=8765, help="Port de l'application lancée (défaut: 8765)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers uvicorn (défaut: 1)")
+    parser.add_argument("--backend", default="together", choices=("together", "local"),
+                        help="DISTRACTOR_BACKEND de l'application lancée (défaut: together, via le faux service)")
+    parser.add_argument("--port-ia", type=int, default=8766, help="Port du faux service d'IA (défaut: 8766)")
+    parser.add_argument("--latence-ia", type=float, default=0.3, help="Latence du faux service en secondes (défaut: 0.3)")
+    parser.add_argument("--gigue-ia", type=float, default=0.1, help="Gigue de latence en secondes (défaut: 0.1)")
+    parser.add_argument("--paliers", default="10,50,100", help="Nombres de joueurs concurrents (défaut: 10,50,100)")
+    parser.add_argument("--duree", type=float, default=20, help="Durée de chaque palier en secondes (défaut: 20)")
+    parser.add_argument("--pause", type=float, default=0.0, help="Temps de réflexion moyen d'un joueur en secondes")
+    parser.add_argument("--langue", default="fr", help="Accept-Language envoyé (défaut: fr)")
+    parser.add_argument("--references", default=REFERENCES, help="Références séparées par ';'")
+    parser.add_argument("--graine", type=int, default=42, help="Graine du tirage des requêtes")
+    parser.add_argument("--timeout-demarrage", type=float, default=120, help="Attente max de /ready en secondes")
+    args = parser.parse_args()
+
+    stub, app = None, None
+    if args.url is None:
+        stub = demarrer_stub_ia(args.port_ia, args.latence_ia, args.gigue_ia)
+        app = demarrer_app(args.port, f"http://127.0.0.1:{args.port_ia}/v1/chat/completions", args.backend, args.workers)
+        args.url = f"http://127.0.0.1:{args.port}"
+        print(f"🚀 main:app sur {args.url}, faux service d'IA sur le port {args.port_ia} "
+              f"(latence {args.latence_ia}s ± {args.gigue_ia}s)")
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait(timeout=10)
+        if stub is not None:
+            stub.shutdown()
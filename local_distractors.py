@@ -0,0 +1,216 @@
+# local_distractors.py
+"""
+Modèle local de distracteurs, entraîné hors ligne sur le corpus chargé.
+
+Chaque mot du vocabulaire est représenté par ses cooccurrences (fenêtre de quelques
+mots) avec les mots de contexte les plus fréquents, pondérées en PPMI puis réduites
+par SVD. Les plus proches voisins de chaque mot sont pré-calculés : proposer des
+distracteurs revient à lire une ligne de cette table, puis à la reclasser selon le
+contexte de la question (quelques produits scalaires).
+
+Entraînement hors ligne (écrit modeles/distracteurs_<lang>.npz) :
+    python local_distractors.py --sortie modeles
+Sans fichier, ou si le fichier a été entraîné sur un autre corpus (empreinte
+différente, ex: après un rechargement), le modèle est entraîné au chargement des données.
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from bible_loader import BibleLoader, BibleSnapshot, register_index
+from text_utils import normalize_text
+
+MODEL_DIR = os.environ.get("DISTRACTOR_MODEL_DIR", "modeles")
+VOCAB_SIZE = 5000
+CONTEXT_SIZE = 1000
+WINDOW = 3
+DIMENSIONS = 64
+NEIGHBOURS = 30
+
+_cleaner = re.compile(r'[^\w\s-]')
+
+
+def empreinte_corpus(verses: Sequence[dict]) -> str:
+    """Empreinte des versets et des paramètres d'entraînement, enregistrée avec le modèle."""
+    h = hashlib.sha256(f"{VOCAB_SIZE}:{CONTEXT_SIZE}:{WINDOW}:{DIMENSIONS}:{NEIGHBOURS}".encode())
+    for v in verses:
+        h.update(f"\n{v.get('book_name')}|{v.get('chapter')}|{v.get('verse')}|{v.get('text', '')}".encode())
+    return h.hexdigest()
+
+
+def entrainer(verses: Sequence[dict], vocab_size: int = VOCAB_SIZE, context_size: int = CONTEXT_SIZE,
+              window: int = WINDOW, dimensions: int = DIMENSIONS, neighbours: int = NEIGHBOURS) -> Dict[str, np.ndarray]:
+    """Entraîne le modèle ; retourne les tableaux à sauvegarder (voir LocalDistractorModel)."""
+    # 1. Tokens normalisés, formes d'affichage et fréquences
+    tokens: List[str] = []
+    verse_ids: List[int] = []
+    counts: Counter = Counter()
+    surfaces: Dict[str, Counter] = {}
+    norms: Dict[str, str] = {}
+    for i, v in enumerate(verses):
+        for mot in v.get("text", "").split():
+            norm = norms.get(mot)
+            if norm is None:
+                norm = norms[mot] = normalize_text(mot)
+            if not norm:
+                continue
+            tokens.append(norm)
+            verse_ids.append(i)
+            counts[norm] += 1
+            surface = _cleaner.sub('', mot)
+            if len(surface) > 3:
+                surfaces.setdefault(norm, Counter())[surface] += 1
+
+    # 2. Vocabulaire cible (mots de plus de 3 lettres) et mots de contexte
+    vocab = [w for w, _ in counts.most_common() if w in surfaces][:vocab_size]
+    contexts = [w for w, _ in counts.most_common(context_size)]
+    vocab_id = {w: i for i, w in enumerate(vocab)}
+    context_id = {w: i for i, w in enumerate(contexts)}
+
+    t = np.fromiter((vocab_id.get(w, -1) for w in tokens), dtype=np.int64, count=len(tokens))
+    x = np.fromiter((context_id.get(w, -1) for w in tokens), dtype=np.int64, count=len(tokens))
+    vid = np.asarray(verse_ids, dtype=np.int64)
+
+    # 3. Matrice de cooccurrences (sans traverser les limites de versets)
+    cooc = np.zeros(len(vocab) * len(contexts), dtype=np.float64)
+    for offset in range(1, window + 1):
+        for a, b in ((t[:-offset], x[offset:]), (t[offset:], x[:-offset])):
+            same = vid[:-offset] == vid[offset:]
+            keep = same & (a >= 0) & (b >= 0)
+            cooc += np.bincount(a[keep] * len(contexts) + b[keep], minlength=cooc.size)
+    cooc = cooc.reshape(len(vocab), len(contexts))
+
+    # 4. PPMI puis SVD tronquée
+    total = cooc.sum() or 1.0
+    row = cooc.sum(axis=1, keepdims=True)
+    col = cooc.sum(axis=0, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmi = np.log(cooc * total / (row * col))
+    ppmi = np.nan_to_num(np.maximum(pmi, 0.0), nan=0.0, posinf=0.0)
+    u, s, _ = np.linalg.svd(ppmi, full_matrices=False)
+    k = min(dimensions, len(s))
+    emb = (u[:, :k] * np.sqrt(s[:k])).astype(np.float32)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True) + 1e-9
+
+    # 5. Plus proches voisins, par blocs pour borner la mémoire
+    n = min(neighbours, max(len(vocab) - 1, 0))
+    table = np.zeros((len(vocab), n), dtype=np.int32)
+    for start in range(0, len(vocab), 1024):
+        sims = emb[start:start + 1024] @ emb.T
+        sims[np.arange(sims.shape[0]), np.arange(start, start + sims.shape[0])] = -np.inf
+        if n:
+            top = np.argpartition(-sims, n - 1, axis=1)[:, :n]
+            order = np.argsort(-np.take_along_axis(sims, top, axis=1), axis=1)
+            table[start:start + sims.shape[0]] = np.take_along_axis(top, order, axis=1)
+
+    return {
+        "vocab": np.array(vocab),
+        "surfaces": np.array([surfaces[w].most_common(1)[0][0] for w in vocab]),
+        "contexts": np.array(contexts),
+        "embeddings": emb,
+        "neighbours": table,
+        "empreinte": np.array(empreinte_corpus(verses)),
+    }
+
+
+class LocalDistractorModel:
+    """Propose des distracteurs plausibles dans le contexte, sans appel réseau."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.vocab = arrays["vocab"].tolist()
+        self.surfaces = arrays["surfaces"].tolist()
+        self.embeddings = arrays["embeddings"]
+        self.neighbours = arrays["neighbours"]
+        self.vocab_id = {w: i for i, w in enumerate(self.vocab)}
+
+    @classmethod
+    def for_snapshot(cls, snapshot: BibleSnapshot, lang: str) -> "LocalDistractorModel":
+        """
+        Charge le modèle entraîné hors ligne s'il a été entraîné sur les versets du
+        snapshot, sinon l'entraîne sur le snapshot.
+        """
+        verses = snapshot.bibles.get(lang, [])
+        path = os.path.join(MODEL_DIR, f"distracteurs_{lang}.npz")
+        if os.path.exists(path):
+            with np.load(path) as data:
+                arrays = {key: data[key] for key in data.files}
+            if "empreinte" in arrays and str(arrays["empreinte"]) == empreinte_corpus(verses):
+                return cls(arrays)
+            print(f"⚠️  {path} entraîné sur un autre corpus : modèle ré-entraîné "
+                  f"(relancer python local_distractors.py --sortie {MODEL_DIR})")
+        return cls(entrainer(verses))
+
+    def _context_vector(self, contexte: Sequence[str]) -> Optional[np.ndarray]:
+        ids = [self.vocab_id[w] for w in (normalize_text(m) for m in contexte) if w in self.vocab_id]
+        if not ids:
+            return None
+        return self.embeddings[ids].mean(axis=0)
+
+    def suggest(self, mot: str, contexte: Sequence[str] = (), k: int = 3, rng=random) -> List[str]:
+        """
+        Retourne jusqu'à k distracteurs : voisins du mot correct, reclassés selon
+        leur proximité avec le contexte de la question, puis tirés parmi les meilleurs.
+        """
+        cible = normalize_text(mot)
+        contexte_vec = self._context_vector(contexte)
+        word_id = self.vocab_id.get(cible)
+
+        if word_id is not None:
+            candidats = self.neighbours[word_id]
+            scores = self.embeddings[candidats] @ self.embeddings[word_id]
+        elif contexte_vec is not None:
+            # Mot hors vocabulaire : voisins du contexte
+            sims = self.embeddings @ contexte_vec
+            candidats = np.argpartition(-sims, min(len(sims) - 1, NEIGHBOURS))[:NEIGHBOURS]
+            scores = sims[candidats]
+        else:
+            return []
+
+        if contexte_vec is not None:
+            scores = scores + 0.5 * (self.embeddings[candidats] @ contexte_vec)
+        ordre = candidats[np.argsort(-scores)].tolist()
+
+        deja = {normalize_text(m) for m in contexte}
+        valides = []
+        for i in ordre:
+            w = self.vocab[i]
+            # Écarter le mot lui-même, ses variantes (pluriel, conjugaison) et le contexte
+            if w == cible or w in deja or w.startswith(cible[:4]) or cible.startswith(w[:4]):
+                continue
+            valides.append(i)
+            if len(valides) >= 3 * k:
+                break
+
+        choisis = rng.sample(valides, min(k, len(valides)))
+        return [self._display(self.surfaces[i], mot) for i in choisis]
+
+    @staticmethod
+    def _display(surface: str, modele: str) -> str:
+        """Forme la plus courante du mot (noms propres inclus), en majuscule si le mot correct l'est."""
+        return surface[:1].upper() + surface[1:] if modele[:1].isupper() else surface
+
+
+register_index("modele_distracteurs", LocalDistractorModel.for_snapshot)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entraîne le modèle local de distracteurs.")
+    parser.add_argument("--sortie", default=MODEL_DIR, help=f"Dossier de sortie (défaut: {MODEL_DIR})")
+    parser.add_argument("--langues", default=None, help="Langues, ex: fr,en (défaut: toutes)")
+    args = parser.parse_args()
+
+    loader = BibleLoader()
+    os.makedirs(args.sortie, exist_ok=True)
+    langues = [l.strip() for l in args.langues.split(",")] if args.langues else list(loader.bibles)
+
+    for lang in langues:
+        start = time.perf_counter()
+        arrays = entrainer(loader.get_verses(lang))
+        path = os.path.join(args.sortie, f"distracteurs_{lang}.npz")
+        np.savez_compressed(path, **arrays)
+        print(f"✅ {path} : {len(arrays['vocab'])} mots en {time.perf_counter() - start:.1f}s")
@@ -1,9 +1,37 @@
+import os
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request 
 from fastapi.middleware.cors import CORSMiddleware
+from bible_loader import bible_loader
+from fast_json import FastJSONResponse
+from admission import AdmissionMiddleware, ReadinessMiddleware, RouteLimit
 from game_routes import router as game_router # type: ignore
 from duel_routes import router as duel_router # type: ignore
+from admin_routes import router as admin_router # type: ignore
+from learner_routes import router as learner_router # type: ignore
+from duel_ws import router as duel_ws_router # type: ignore
+from popularity import popularity_log
+from warming import prechauffer_caches
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Chargement des données et des index en arrière-plan : le serveur accepte
+    # les connexions tout de suite, /ready passe au vert une fois le chargement et
+    # le préchauffage des caches (références populaires, budget WARMUP_BUDGET_S) terminés
+    threading.Thread(target=bible_loader.warm_up, args=(prechauffer_caches,),
+                     name="bible-warm-up", daemon=True).start()
+    # Références et paramètres les plus demandés, pour le préchauffage du prochain démarrage
+    popularity_log.start_flusher()
+    
+    # Rechargement automatique si BIBLE_WATCH_INTERVAL est défini (en secondes)
+    watch_interval = os.environ.get("BIBLE_WATCH_INTERVAL")
+    if watch_interval:
+        bible_loader.start_watcher(float(watch_interval))
+    yield
+    popularity_log.flush()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # 🆕 AJOUTER CE MIDDLEWARE ICI
 @app.middleware("http")
@@ -15,17 +43,47 @@ async def add_language_to_request(request: Request, call_next):
     else:
         request.state.language = "fr"
     
-    response = await call_next(request)
+    # Toute la requête voit le même snapshot, même si un rechargement a lieu entre-temps
+    with bible_loader.pinned():
+        response = await call_next(request)
     return response
 
-# Endpoint de santé pour UptimeRobot
+# Limites de concurrence des routes coûteuses (appel IA jusqu'à IA_TIMEOUT secondes)
+route_limits = {
+    "/qcm/random": RouteLimit(
+        max_concurrent=int(os.environ.get("QCM_RANDOM_MAX_CONCURRENT", "4")),
+        max_queue=int(os.environ.get("QCM_RANDOM_MAX_QUEUE", "8")),
+        max_wait=float(os.environ.get("QCM_RANDOM_MAX_WAIT", "2"))
+    ),
+}
+app.add_middleware(AdmissionMiddleware, limits=route_limits)
+
+# Pendant le chargement initial, les routes attendent brièvement puis répondent 503
+app.add_middleware(
+    ReadinessMiddleware,
+    ready=bible_loader.ready,
+    max_wait=float(os.environ.get("READY_MAX_WAIT", "5"))
+)
+
+# Endpoint de santé pour UptimeRobot (async : ne dépend pas du pool de threads)
+# Liveness : répond dès que le processus tourne, même pendant le chargement
 @app.get("/health")
-def health():
-    return {"status": "ok"}
+async def health():
+    return {"status": "ok", "ready": bible_loader.ready.is_set()}
+
+# Readiness : 200 seulement une fois les données, index et caches prêts
+@app.get("/ready")
+async def ready():
+    if not bible_loader.ready.is_set():
+        return FastJSONResponse({"status": "loading"}, status_code=503)
+    return {"status": "ready", "version": bible_loader.version}
 
 # Inclure les routes
 app.include_router(game_router)
 app.include_router(duel_router)
+app.include_router(admin_router)
+app.include_router(learner_router)
+app.include_router(duel_ws_router)
 
 if __name__ == "__main__":
     import uvicorn
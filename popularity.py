@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+from bible_loader import bible_loader
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre processus (un seul worker)
+    fcntl = None
+
+POPULARITY_FILE = os.environ.get("POPULARITY_FILE", "popularite.json")
+# Entrées conservées dans le fichier (les plus demandées)
+POPULARITY_MAX_ENTRIES = int(os.environ.get("POPULARITY_MAX_ENTRIES", "500"))
+# Demi-vie des compteurs : une référence qui n'est plus demandée sort peu à peu du fichier
+POPULARITY_HALF_LIFE_H = float(os.environ.get("POPULARITY_HALF_LIFE_H", "24"))
+POPULARITY_FLUSH_INTERVAL = float(os.environ.get("POPULARITY_FLUSH_INTERVAL", "60"))
+
+# (route, langue, clé, paramètre) : référence canonique et niveau pour les questions,
+# référence canonique pour les passages, mot et livre pour les distracteurs
+Entree = Tuple[str, str, str, str]
+
+
+class PopularityLog:
+    """
+    Compteurs des références et paramètres de jeu les plus demandés, fusionnés
+    périodiquement dans un fichier JSON compact (poids décroissants avec le temps,
+    seules les `max_entries` entrées les plus lourdes sont gardées).
+    Plusieurs workers peuvent partager le fichier : chacun y ajoute ses compteurs,
+    la lecture-fusion-écriture étant protégée par un verrou (flock sur `<fichier>.lock`).
+    """
+
+    def __init__(self, path: str, max_entries: int, half_life_h: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.half_life_s = half_life_h * 3600
+        self._compteurs: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    def enregistrer(self, route: str, langue: str, cle: str, parametre: str = ""):
+        """Compte une demande (la clé doit déjà être canonique, voir enregistrer_reference)."""
+        with self._lock:
+            self._compteurs[(route, langue, cle, parametre or "")] += 1
+            # Borne la mémoire entre deux écritures
+            if len(self._compteurs) > 4 * self.max_entries:
+                self._compteurs = Counter(dict(self._compteurs.most_common(self.max_entries)))
+
+    def enregistrer_reference(self, route: str, langue: str, reference: str, parametre: str = ""):
+        """Compte une demande de passage ou de question, sous la forme canonique de sa référence."""
+        canonique = bible_loader.canonical_reference(reference, langue)
+        if canonique is not None:
+            self.enregistrer(route, langue, canonique, parametre)
+
+    @contextmanager
+    def _verrou_fichier(self):
+        """Verrou exclusif entre processus autour d'une mise à jour du fichier."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as verrou:
+            fcntl.flock(verrou, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(verrou, fcntl.LOCK_UN)
+
+    def _lire(self) -> Tuple[float, Counter]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                contenu = json.load(f)
+            poids = Counter({tuple(e[:4]): float(e[4]) for e in contenu.get("entrees", [])})
+            return float(contenu.get("mis_a_jour", time.time())), poids
+        except FileNotFoundError:
+            return time.time(), Counter()
+        except (ValueError, TypeError, IndexError, AttributeError) as e:
+            print(f"⚠️  Fichier de popularité {self.path} illisible, ignoré: {e}")
+            return time.time(), Counter()
+
+    def populaires(self, limite: Optional[int] = None) -> List[Tuple[Entree, float]]:
+        """Entrées du fichier et compteurs en attente, de la plus demandée à la moins demandée."""
+        _, poids = self._lire()
+        with self._lock:
+            poids.update(self._compteurs)
+        # Tri stable : à poids égal, ordre alphabétique
+        entrees = sorted(poids.items(), key=lambda e: (-e[1], e[0]))
+        return entrees[:limite] if limite else entrees
+
+    def flush(self):
+        """Fusionne les compteurs en attente dans le fichier (écriture atomique)."""
+        with self._lock:
+            compteurs, self._compteurs = self._compteurs, Counter()
+        if not compteurs:
+            return
+
+        try:
+            with self._verrou_fichier():
+                self._fusionner(compteurs)
+        except OSError as e:
+            print(f"⚠️  Verrou du fichier de popularité impossible: {e}")
+
+    def _fusionner(self, compteurs: Counter):
+        """Relit le fichier, applique la décroissance, ajoute les compteurs et le réécrit (sous verrou)."""
+        mis_a_jour, poids = self._lire()
+        maintenant = time.time()
+        decroissance = 0.5 ** (max(0.0, maintenant - mis_a_jour) / self.half_life_s) if self.half_life_s > 0 else 1.0
+        for entree in poids:
+            poids[entree] *= decroissance
+        poids.update(compteurs)
+
+        entrees = sorted(poids.items(), key=lambda e: (-e[1], e[0]))[:self.max_entries]
+        contenu = {
+            "mis_a_jour": maintenant,
+            "entrees": [[*entree, round(p, 3)] for entree, p in entrees if p >= 0.01]
+        }
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(contenu, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️  Écriture du fichier de popularité impossible: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def start_flusher(self, interval: float = POPULARITY_FLUSH_INTERVAL):
+        """Démarre un thread qui écrit les compteurs toutes les `interval` secondes."""
+        if self._flusher is not None or interval <= 0:
+            return
+
+        def boucle():
+            while True:
+                time.sleep(interval)
+                self.flush()
+
+        self._flusher = threading.Thread(target=boucle, name="popularity-flush", daemon=True)
+        self._flusher.start()
+
+
+popularity_log = PopularityLog(POPULARITY_FILE, POPULARITY_MAX_ENTRIES, POPULARITY_HALF_LIFE_H)
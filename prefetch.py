@@ -0,0 +1,211 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+from bible_loader import BibleSnapshot, bible_loader
+from popularity import popularity_log
+from text_utils import normalize_text
+
+PREFETCH_DEPTH = int(os.environ.get("PREFETCH_DEPTH", "3"))
+PREFETCH_TTL = float(os.environ.get("PREFETCH_TTL", "300"))
+PREFETCH_MAX_SESSIONS = int(os.environ.get("PREFETCH_MAX_SESSIONS", "1000"))
+PREFETCH_WORKERS = int(os.environ.get("PREFETCH_WORKERS", "2"))
+# Réserve partagée (hors session) des références populaires, remplie au démarrage
+POOL_TTL = float(os.environ.get("POOL_TTL", "3600"))
+POOL_MAX_KEYS = int(os.environ.get("POOL_MAX_KEYS", "500"))
+
+
+def reponses(result: Dict[str, Any]) -> List[str]:
+    """Mots-réponses d'une question générée (QCM ou texte à trous), normalisés."""
+    if "reponse_correcte" in result:
+        mots = [result["reponse_correcte"]]
+    else:
+        mots = result.get("reponses", [])
+    return [normalize_text(m) for m in mots]
+
+
+class PrefetchBuffer:
+    """
+    Questions générées d'avance, par session de jeu : au plus `depth` par clé
+    (session, route, langue, paramètres), expirées après `ttl` secondes, et au plus
+    `max_sessions` clés (les moins récemment utilisées sont évincées).
+    """
+
+    def __init__(self, depth: int, ttl: float, max_sessions: int, workers: int):
+        self.depth = depth
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.hits = 0
+        self.misses = 0
+        self._buffers: "OrderedDict[Hashable, deque]" = OrderedDict()
+        self._pending: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+
+    def pop(self, key: Hashable, deja_utilises: Set[str]) -> Optional[Dict[str, Any]]:
+        """Retourne la prochaine question encore valide (non expirée, mots non utilisés)."""
+        now = time.monotonic()
+        with self._lock:
+            buffer = self._buffers.get(key)
+            while buffer:
+                created, result = buffer.popleft()
+                if now - created <= self.ttl and not deja_utilises.intersection(reponses(result)):
+                    self._buffers.move_to_end(key)
+                    self.hits += 1
+                    return result
+            self.misses += 1
+            return None
+
+    def schedule(self, key: Hashable, generer: Callable[[Set[str]], Dict[str, Any]], deja_utilises: Set[str]):
+        """Complète le buffer de `key` en arrière-plan (une seule tâche par clé à la fois)."""
+        with self._lock:
+            if key in self._pending or self.depth <= 0:
+                return
+            self._pending.add(key)
+        self._executor.submit(self._fill, key, generer, set(deja_utilises))
+
+    def fill(self, key: Hashable, generer: Callable[[Set[str]], Dict[str, Any]],
+             deja_utilises: Set[str]) -> List[Dict[str, Any]]:
+        """Complète le buffer de `key` dans le thread appelant ; retourne les questions ajoutées."""
+        with self._lock:
+            if key in self._pending or self.depth <= 0:
+                return []
+            self._pending.add(key)
+        return self._fill(key, generer, set(deja_utilises))
+
+    def _fill(self, key: Hashable, generer: Callable[[Set[str]], Dict[str, Any]],
+              deja_utilises: Set[str]) -> List[Dict[str, Any]]:
+        ajoutees = []
+        try:
+            with self._lock:
+                buffer = self._buffers.setdefault(key, deque(maxlen=self.depth))
+                self._buffers.move_to_end(key)
+                while len(self._buffers) > self.max_sessions:
+                    self._buffers.popitem(last=False)
+                for _, result in buffer:
+                    deja_utilises.update(reponses(result))
+                manquants = self.depth - len(buffer)
+
+            for _ in range(manquants):
+                result = generer(deja_utilises)
+                if not isinstance(result, dict) or "error" in result:
+                    break
+                deja_utilises.update(reponses(result))
+                ajoutees.append(result)
+                with self._lock:
+                    buffer.append((time.monotonic(), result))
+        except Exception as e:
+            print(f"⚠️  Pré-génération échouée pour {key[1]}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+        return ajoutees
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._buffers
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        with self._lock:
+            questions = sum(len(b) for b in self._buffers.values())
+        return {
+            "sessions": len(self._buffers),
+            "questions": questions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None
+        }
+
+
+prefetch_buffer = PrefetchBuffer(PREFETCH_DEPTH, PREFETCH_TTL, PREFETCH_MAX_SESSIONS, PREFETCH_WORKERS)
+warm_pool = PrefetchBuffer(PREFETCH_DEPTH, POOL_TTL, POOL_MAX_KEYS, PREFETCH_WORKERS)
+
+# Routes décorées par `prefetched`, par nom de fonction (pour le préchauffage)
+ROUTES: Dict[str, Callable] = {}
+
+
+def pool_key(route: str, language: str, reference: str, niveau: str) -> Optional[Hashable]:
+    """Clé de la réserve partagée : les références couvrant les mêmes versets la partagent."""
+    spans = bible_loader.resolve_reference(reference)
+    if not spans:
+        return None
+    return (None, route, language, bible_loader.version,
+            tuple((s.start, s.stop) for s in spans), niveau)
+
+
+def generateur(func: Callable, data: Any, language: str, snapshot: BibleSnapshot) -> Callable[[Set[str]], Dict[str, Any]]:
+    """
+    Génération d'arrière-plan d'une route : sur le snapshot de la requête d'origine
+    (épinglé, même si un rechargement a eu lieu depuis) et sans réutiliser sa Request,
+    déjà terminée quand la tâche s'exécute.
+    """
+    request = SimpleNamespace(state=SimpleNamespace(language=language))
+
+    def generer(mots: Set[str]) -> Dict[str, Any]:
+        with bible_loader.pinned(snapshot):
+            return func(data.model_copy(update={"mots_deja_utilises": sorted(mots)}), request)
+
+    return generer
+
+
+def prefill(route: str, data: Any, language: str) -> List[Dict[str, Any]]:
+    """Remplit la réserve partagée d'une route pour un corps de requête ; retourne les questions ajoutées."""
+    with bible_loader.pinned() as snapshot:
+        key = pool_key(route, language, data.reference, data.niveau)
+    if key is None:
+        return []
+    return warm_pool.fill(key, generateur(ROUTES[route], data, language, snapshot), set())
+
+
+def prefetched(func: Callable) -> Callable:
+    """
+    Route (corps, request) dont les prochaines questions sont pré-générées quand le
+    corps porte un `session_id` : la réponse vient du buffer de la session si possible,
+    puis le buffer est complété en arrière-plan en excluant les mots déjà utilisés
+    (ceux du client et ceux des questions déjà en attente).
+    Sans question en attente pour la session, une question de la réserve partagée
+    (références populaires préchauffées) est servie puis remplacée en arrière-plan.
+    """
+    params = list(inspect.signature(func).parameters)
+    ROUTES[func.__name__] = func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = dict(zip(params, args), **kwargs)
+        data, request = arguments[params[0]], arguments[params[1]]
+        if getattr(data, "seed", None) is not None:
+            return func(*args, **kwargs)
+
+        language = getattr(request.state, "language", "fr")
+        # Les remplissages d'arrière-plan gardent le snapshot de cette requête (clés par version)
+        snapshot = bible_loader.snapshot
+        popularity_log.enregistrer_reference(func.__name__, language, data.reference, data.niveau)
+        deja_utilises = {normalize_text(m) for m in (data.mots_deja_utilises or [])}
+
+        result = None
+        if data.session_id:
+            key = (data.session_id, func.__name__, language, bible_loader.version,
+                   data.reference, data.niveau, data.learner_id)
+            result = prefetch_buffer.pop(key, deja_utilises)
+        if result is None and not data.learner_id:
+            # Les questions d'un profil apprenant dépendent de ce profil : pas de réserve partagée
+            cle_reserve = pool_key(func.__name__, language, data.reference, data.niveau)
+            if cle_reserve is not None:
+                result = warm_pool.pop(cle_reserve, deja_utilises)
+                if cle_reserve in warm_pool:
+                    corps = data.model_copy(update={"session_id": None})
+                    warm_pool.schedule(cle_reserve, generateur(func, corps, language, snapshot), set())
+        if result is None:
+            result = func(*args, **kwargs)
+        if data.session_id and isinstance(result, dict) and "error" not in result:
+            deja_utilises.update(reponses(result))
+            prefetch_buffer.schedule(key, generateur(func, data, language, snapshot), deja_utilises)
+        return result
+
+    return wrapper
@@ -0,0 +1,121 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from rapidfuzz.distance import Levenshtein
+from text_utils import normalize_text
+
+# Similarité minimale (0-1, après normalisation) pour qu'un mot différent compte comme mal orthographié
+RECITATION_TOLERANCE = float(os.environ.get("RECITATION_TOLERANCE", "0.7"))
+# Au-delà de (mots de référence x mots saisis) dans un bloc différent, appariement par position
+MAX_BLOC = 2500
+
+# Les mêmes mots reviennent à chaque pause de frappe
+_normaliser = lru_cache(maxsize=65536)(normalize_text)
+
+CORRECT, MAL_ORTHOGRAPHIE, MANQUANT, EN_TROP, A_VENIR = "correct", "mal_orthographie", "manquant", "en_trop", "a_venir"
+
+
+def _apparier(ref: List[str], saisie: List[str], i0: int, i1: int, j0: int, j1: int) -> List[Tuple[Optional[int], Optional[int]]]:
+    """
+    Apparie les mots d'un bloc différent (ref[i0:i1] / saisie[j0:j1]) en maximisant la
+    similarité totale des paires, dans l'ordre ; retourne (i, j), (i, None) ou (None, j).
+    Les blocs trop grands (saisie sans rapport) sont appariés par position.
+    """
+    n, m = i1 - i0, j1 - j0
+    if n * m > MAX_BLOC:
+        paires = []
+        for k in range(max(n, m)):
+            i, j = (i0 + k if k < n else None), (j0 + k if k < m else None)
+            if i is not None and j is not None and \
+                    Levenshtein.normalized_similarity(ref[i], saisie[j]) < RECITATION_TOLERANCE:
+                paires.extend([(i, None), (None, j)])
+            else:
+                paires.append((i, j))
+        return paires
+
+    sim = [[Levenshtein.normalized_similarity(ref[i0 + a], saisie[j0 + b]) for b in range(m)] for a in range(n)]
+    # meilleur[a][b] : similarité totale maximale pour ref[i0+a:i1] / saisie[j0+b:j1]
+    meilleur = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for a in range(n - 1, -1, -1):
+        for b in range(m - 1, -1, -1):
+            paire = sim[a][b] + meilleur[a + 1][b + 1] if sim[a][b] >= RECITATION_TOLERANCE else 0.0
+            meilleur[a][b] = max(meilleur[a + 1][b], meilleur[a][b + 1], paire)
+
+    paires, a, b = [], 0, 0
+    while a < n or b < m:
+        if a < n and b < m and sim[a][b] >= RECITATION_TOLERANCE \
+                and meilleur[a][b] == sim[a][b] + meilleur[a + 1][b + 1]:
+            paires.append((i0 + a, j0 + b))
+            a, b = a + 1, b + 1
+        elif b < m and (a == n or meilleur[a][b] == meilleur[a][b + 1]):
+            paires.append((None, j0 + b))
+            b += 1
+        else:
+            paires.append((i0 + a, None))
+            a += 1
+    return paires
+
+
+def aligner(reference: List[str], saisie: List[str], partiel: bool = False) -> Dict[str, Any]:
+    """
+    Aligne mot à mot le texte saisi sur le texte de référence (distance d'édition
+    sur les listes de mots normalisés) et note chaque mot :
+    - correct / mal_orthographie : mot de référence saisi (exactement / approximativement)
+    - manquant : mot de référence absent de la saisie
+    - en_trop : mot saisi absent de la référence
+    - a_venir : (mode partiel) mots de référence après la fin de la saisie, non notés
+    Score : (corrects + ½ mal orthographiés) / (mots de référence notés + mots en trop).
+    """
+    ref_norm = [_normaliser(m) for m in reference]
+    saisie_norm = [_normaliser(m) for m in saisie]
+    mots: List[Dict[str, Any]] = []
+
+    def ajouter(statut: str, i: int = None, j: int = None):
+        mots.append({
+            "statut": statut,
+            "mot": reference[i] if i is not None else None,
+            "saisi": saisie[j] if j is not None else None
+        })
+
+    # Les opérations consécutives hors "equal" forment un bloc, apparié au mieux ensuite
+    blocs, bloc = [], None
+    for op in Levenshtein.opcodes(ref_norm, saisie_norm):
+        if op.tag == "equal":
+            if bloc:
+                blocs.append(bloc)
+                bloc = None
+            blocs.append(("equal", op.src_start, op.src_end, op.dest_start, op.dest_end))
+        elif bloc is None:
+            bloc = ["diff", op.src_start, op.src_end, op.dest_start, op.dest_end]
+        else:
+            bloc[2], bloc[4] = op.src_end, op.dest_end
+    if bloc:
+        blocs.append(bloc)
+
+    for tag, i0, i1, j0, j1 in blocs:
+        if tag == "equal":
+            for k in range(i1 - i0):
+                ajouter(CORRECT, i0 + k, j0 + k)
+            continue
+        for i, j in _apparier(ref_norm, saisie_norm, i0, i1, j0, j1):
+            if i is not None and j is not None:
+                ajouter(CORRECT if ref_norm[i] == saisie_norm[j] else MAL_ORTHOGRAPHIE, i, j)
+            elif i is not None:
+                ajouter(MANQUANT, i)
+            else:
+                ajouter(EN_TROP, j=j)
+
+    if partiel:
+        # La récitation est en cours : les mots manquants en fin de texte restent à venir
+        for mot in reversed(mots):
+            if mot["statut"] != MANQUANT:
+                break
+            mot["statut"] = A_VENIR
+
+    compte = {statut: 0 for statut in (CORRECT, MAL_ORTHOGRAPHIE, MANQUANT, EN_TROP, A_VENIR)}
+    for mot in mots:
+        compte[mot["statut"]] += 1
+    notes = len(reference) - compte[A_VENIR] + compte[EN_TROP]
+    score = (compte[CORRECT] + 0.5 * compte[MAL_ORTHOGRAPHIE]) / notes if notes else 0.0
+
+    return {"score": round(100 * score, 1), "compte": compte, "mots": mots}
@@ -0,0 +1,67 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Modules à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LIVRES = {
+    "fr": ["Genèse", "Exode", "Psaumes", "Jean", "1 Jean", "Apocalypse"],
+    "en": ["Genesis", "Exodus", "Psalms", "John", "1 John", "Revelation"],
+}
+MOTS = {
+    "fr": "Dieu amour monde vie parole lumière ténèbres esprit homme femme peuple terre ciel grâce "
+          "vérité chemin Seigneur fils père royaume et de la".split(),
+    "en": "God love world life word light darkness spirit man woman people earth heaven grace "
+          "truth way Lord son father kingdom and the of".split(),
+}
+
+
+def generer_bible(lang: str, graine: int = 1) -> list:
+    """Petite Bible synthétique : 6 livres, 3 à 5 chapitres, une dizaine de versets par chapitre."""
+    rng = random.Random(graine)
+    versets = []
+    for i, livre in enumerate(LIVRES[lang]):
+        for chapitre in range(1, 4 + i % 3):
+            for numero in range(1, 10 + chapitre % 4):
+                texte = " ".join(rng.choice(MOTS[lang]) for _ in range(rng.randint(6, 18))) + "."
+                versets.append({"book_name": livre, "chapter": chapitre, "verse": numero,
+                                "text": texte[0].upper() + texte[1:]})
+    return versets
+
+
+@pytest.fixture
+def bibles():
+    return {lang: generer_bible(lang) for lang in LIVRES}
+
+
+@pytest.fixture
+def fichiers_bible(tmp_path, bibles):
+    """Fichiers JSON des deux langues, au format lu par BibleLoader."""
+    fichiers = {"fr": str(tmp_path / "segond_1910.json"), "en": str(tmp_path / "kjv.json")}
+    for lang, path in fichiers.items():
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"verses": bibles[lang]}, f, ensure_ascii=False)
+    return fichiers
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, fichiers_bible):
+    # Bases SQLite des apprenants / duels créées dans le dossier temporaire
+    monkeypatch.chdir(tmp_path)
+    import main
+    import game_routes
+    from bible_loader import bible_loader
+    from caches import seeded_cache
+
+    # Distracteurs du modèle local : pas d'appel réseau
+    monkeypatch.setattr(game_routes, "DISTRACTOR_BACKEND", "local")
+    monkeypatch.setattr(bible_loader, "files", fichiers_bible)
+    bible_loader.warm_up()
+    seeded_cache.clear()
+    # Sans le lifespan : pas de préchauffage ni de fichier de popularité
+    return TestClient(main.app), seeded_cache
@@ -0,0 +1,17 @@
+from bible_loader import BibleSnapshot
+
+
+def livres(noms):
+    return [{"book_name": nom, "chapter": 1, "verse": 1, "text": "texte"} for nom in noms]
+
+
+def test_numerotation_canonique_entre_langues():
+    snapshot = BibleSnapshot({"fr": livres(["Jean", "Genèse"]), "en": livres(["John"])}, 1)
+    assert snapshot.book_names == {"fr": {43: "Jean", 1: "Genèse"}, "en": {43: "John"}}
+    assert snapshot.get_parallel("Jean 1:1")
+
+
+def test_livres_hors_canon_numerotes_par_nom():
+    a = BibleSnapshot({"fr": livres(["Genèse", "Tobie", "Judith"])}, 1)
+    b = BibleSnapshot({"fr": livres(["Judith", "Genèse", "Tobie"])}, 1)
+    assert a.book_names == b.book_names == {"fr": {1: "Genèse", 67: "Judith", 68: "Tobie"}}
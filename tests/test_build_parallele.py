@@ -0,0 +1,43 @@
+import numpy as np
+
+from bible_loader import BibleSnapshot
+import distractors  # noqa: F401  (déclare l'index "distracteurs")
+import local_distractors  # noqa: F401  (déclare l'index "modele_distracteurs")
+import texte_trous  # noqa: F401  (déclare l'index "tokens")
+
+
+def construire(bibles, workers: int) -> BibleSnapshot:
+    """Même construction que BIBLE_BUILD_WORKERS=<workers>."""
+    snapshot = BibleSnapshot(bibles, 1, {"lecture:fr": 0.0, "lecture:en": 0.0}, workers=workers)
+    snapshot.build_registered_indexes()
+    return snapshot
+
+
+def memes_attributs(a, b):
+    for attr, valeur in vars(a).items():
+        autre = getattr(b, attr)
+        if isinstance(valeur, np.ndarray):
+            assert np.array_equal(valeur, autre), attr
+        else:
+            assert valeur == autre, attr
+
+
+def test_construction_parallele_identique(bibles):
+    seq, par = construire(bibles, 1), construire(bibles, 4)
+
+    assert par.verse_ids == seq.verse_ids
+    assert par.aligned == seq.aligned
+    assert par.fragments == seq.fragments
+    assert par.chapter_spans == seq.chapter_spans
+    for lang in seq.chapter_payloads:
+        # Mêmes octets compressés, dans le même ordre de chapitres
+        assert list(par.chapter_payloads[lang].items()) == list(seq.chapter_payloads[lang].items())
+
+    # Index dans l'ordre d'une construction séquentielle, au contenu identique
+    assert list(par.built_indexes()) == list(seq.built_indexes())
+    for cle, index in seq.built_indexes().items():
+        memes_attributs(index, par.built_indexes()[cle])
+
+    # Mêmes étapes de durée, dans le même ordre
+    assert list(par.timings) == list(seq.timings)
+    assert "index" in seq.timings and "chapitres" in seq.timings
@@ -0,0 +1,11 @@
+import pytest
+
+ROUTES = ["/qcm/batch", "/duel/texte-a-trous/batch", "/duel/ordre/batch", "/duel/session"]
+
+
+@pytest.mark.parametrize("route", ROUTES)
+@pytest.mark.parametrize("nombre,statut", [(0, 400), (21, 400), (10**7, 400), (5, 200)])
+def test_limite_du_nombre(client, route, nombre, statut):
+    client, _ = client
+    reponse = client.post(route, json={"reference": "Jean 1", "niveau": "moyen", "nombre": nombre})
+    assert reponse.status_code == statut, reponse.text
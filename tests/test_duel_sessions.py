@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from duel_sessions import MemoryDuelStore, SqliteDuelStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryDuelStore()
+    return SqliteDuelStore(str(tmp_path / "duels.db"))
+
+
+def test_claim_un_seul_proprietaire(store):
+    store.put("s", {"manches": []}, 60)
+    assert store.claim("s", "w1") == "w1"
+    assert store.claim("s", "w2") == "w1"
+    # Reprise explicite d'un propriétaire arrêté
+    assert store.claim("s", "w2", previous="w1") == "w2"
+    assert store.claim("inconnue", "w1") is None
+
+
+def test_session_expiree(store):
+    store.put("s", {"manches": []}, 0)
+    store.claim("s", "w1")
+    time.sleep(0.01)
+    assert store.get("s") is None
+    assert store.claim("s", "w1") is None
+
+
+def test_expiration_par_get_oublie_le_proprietaire():
+    store = MemoryDuelStore()
+    store.put("s", {"manches": []}, 60)
+    store.claim("s", "w1")
+    store._sessions["s"] = (time.time() - 1, store._sessions["s"][1])
+    assert store.get("s") is None
+    assert "s" not in store._owners
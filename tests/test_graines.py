@@ -0,0 +1,69 @@
+import pytest
+
+# Une route par générateur ; chaque corps porte une graine
+ROUTES = [
+    ("/jeu", {"reference": "Jean 1", "niveau": "moyen"}),
+    ("/qcm", {"reference": "Jean 1", "niveau": "difficile"}),
+    ("/qcm/random", {"reference": "Jean 1", "niveau": "facile"}),
+    ("/remettre-en-ordre", {"reference": "Jean 1:1-5"}),
+    ("/generer-question-reference", {"difficulty": "moyen"}),
+    ("/qcm/batch", {"reference": "Jean 1", "niveau": "moyen", "nombre": 5}),
+    ("/duel/texte-a-trous/batch", {"reference": "Jean 1", "niveau": "moyen", "nombre": 5}),
+    ("/duel/ordre/batch", {"reference": "Jean 1", "niveau": "moyen", "nombre": 5}),
+]
+
+
+@pytest.mark.parametrize("route,corps", ROUTES, ids=[r for r, _ in ROUTES])
+@pytest.mark.parametrize("langue", ["fr", "en"])
+def test_meme_graine_meme_reponse(client, route, corps, langue):
+    client, seeded_cache = client
+    entetes = {"Accept-Language": langue}
+
+    premiere = client.post(route, json={**corps, "seed": 42}, headers=entetes)
+    assert premiere.status_code == 200, premiere.text
+    assert "error" not in premiere.json()
+
+    # Régénérée (cache vidé) : même réponse, octet pour octet
+    seeded_cache.clear()
+    assert client.post(route, json={**corps, "seed": 42}, headers=entetes).content == premiere.content
+    # Servie par le cache des réponses à graine
+    assert client.post(route, json={**corps, "seed": 42}, headers=entetes).content == premiere.content
+
+
+def test_graines_differentes(client):
+    client, _ = client
+    corps = {"reference": "Jean 1", "niveau": "moyen", "nombre": 5}
+    reponses = {client.post("/qcm/batch", json={**corps, "seed": seed}).content for seed in range(5)}
+    assert len(reponses) > 1
+
+
+def test_session_de_duel_rejouable(client):
+    client, _ = client
+    corps = {"reference": "Jean 1", "niveau": "moyen", "nombre": 6, "seed": 7}
+    a = client.post("/duel/session", json=corps).json()
+    b = client.post("/duel/session", json=corps).json()
+    assert a["session_id"] != b["session_id"]
+    assert a["seed"] == b["seed"] == 7
+    assert a["manches"] == b["manches"]
+
+
+def test_cache_a_graine_rend_des_copies():
+    from types import SimpleNamespace
+    from pydantic import BaseModel
+    from caches import memoize_seeded, seeded_cache
+
+    class Corps(BaseModel):
+        reference: str
+        seed: int
+
+    @memoize_seeded
+    def route(data: Corps, request):
+        return {"questions": [{"options": ["a", "b"]}]}
+
+    seeded_cache.clear()
+    requete = SimpleNamespace(state=SimpleNamespace(language="fr"))
+    premiere = route(Corps(reference="Jean 1", seed=1), requete)
+    premiere["questions"][0]["options"].append("modifiée")
+    seconde = route(Corps(reference="Jean 1", seed=1), requete)
+    seconde["annotation"] = True
+    assert route(Corps(reference="Jean 1", seed=1), requete) == {"questions": [{"options": ["a", "b"]}]}
@@ -0,0 +1,26 @@
+import os
+from import_bible import lire_usfm
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def test_usfm_marqueurs_en_milieu_de_ligne():
+    versets = list(lire_usfm(os.path.join(FIXTURES, "psaumes_extrait.usfm"), {}))
+
+    assert [(v["chapter"], v["verse"]) for v in versets] == [(1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 1)]
+    assert {v["book_name"] for v in versets} == {"Psaumes"}
+    # "\p \v 1" et "\q1 \v 2" : le texte du verset ne garde ni le marqueur ni le paragraphe
+    assert versets[0]["text"] == "Heureux l'homme qui ne marche pas selon le conseil des méchants,"
+    # Suite du verset sur la ligne "\q2", note retirée
+    assert versets[1]["text"] == "Mais qui trouve son plaisir dans la loi de l'Éternel, et qui la médite jour et nuit!"
+    # Plusieurs versets sur une ligne, verset groupé "\v 5-6"
+    assert versets[2]["text"] == "Il est comme un arbre planté près d'un courant d'eau."
+    assert versets[3]["text"] == "Il n'en est pas ainsi des méchants."
+    assert versets[4]["text"] == "C'est pourquoi les méchants ne résistent pas."
+    # "\c 2 \p \v 1" sur une seule ligne, attributs de mot retirés
+    assert versets[5]["text"] == "Pourquoi ce tumulte parmi les nations?"
+
+
+def test_usfm_noms_de_livres():
+    versets = list(lire_usfm(os.path.join(FIXTURES, "psaumes_extrait.usfm"), {"PSA": "Psalms"}))
+    assert {v["book_name"] for v in versets} == {"Psalms"}
@@ -0,0 +1,36 @@
+import numpy as np
+
+import local_distractors
+from bible_loader import BibleSnapshot
+from conftest import generer_bible
+from local_distractors import LocalDistractorModel, entrainer
+
+
+def test_modele_hors_ligne_utilise_si_meme_corpus(tmp_path, monkeypatch, bibles):
+    monkeypatch.setattr(local_distractors, "MODEL_DIR", str(tmp_path))
+    arrays = entrainer(bibles["fr"])
+    arrays["vocab"] = np.array(["marqueur"] + arrays["vocab"].tolist()[1:])
+    np.savez_compressed(tmp_path / "distracteurs_fr.npz", **arrays)
+
+    modele = LocalDistractorModel.for_snapshot(BibleSnapshot(bibles, 1), "fr")
+    assert modele.vocab[0] == "marqueur"
+
+
+def test_modele_perime_reentraine(tmp_path, monkeypatch, bibles):
+    monkeypatch.setattr(local_distractors, "MODEL_DIR", str(tmp_path))
+    # Modèle entraîné sur une autre version du corpus
+    np.savez_compressed(tmp_path / "distracteurs_fr.npz", **entrainer(generer_bible("fr", graine=2)))
+
+    modele = LocalDistractorModel.for_snapshot(BibleSnapshot(bibles, 2), "fr")
+    assert modele.vocab == entrainer(bibles["fr"])["vocab"].tolist()
+    assert np.array_equal(modele.neighbours, entrainer(bibles["fr"])["neighbours"])
+
+
+def test_modele_sans_empreinte_reentraine(tmp_path, monkeypatch, bibles):
+    monkeypatch.setattr(local_distractors, "MODEL_DIR", str(tmp_path))
+    arrays = entrainer(bibles["fr"])
+    del arrays["empreinte"]
+    arrays["vocab"] = np.array(["marqueur"] + arrays["vocab"].tolist()[1:])
+    np.savez_compressed(tmp_path / "distracteurs_fr.npz", **arrays)
+
+    assert LocalDistractorModel.for_snapshot(BibleSnapshot(bibles, 1), "fr").vocab[0] != "marqueur"
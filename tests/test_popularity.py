@@ -0,0 +1,23 @@
+import multiprocessing
+
+from popularity import PopularityLog
+
+
+def _worker(path: str, cle: str, tours: int):
+    log = PopularityLog(path, max_entries=100, half_life_h=0)
+    for _ in range(tours):
+        log.enregistrer("passage", "fr", cle)
+        log.flush()
+
+
+def test_flush_concurrent_entre_processus(tmp_path):
+    path = str(tmp_path / "popularite.json")
+    processus = [multiprocessing.Process(target=_worker, args=(path, f"Jean {i}", 50)) for i in range(4)]
+    for p in processus:
+        p.start()
+    for p in processus:
+        p.join()
+
+    # Aucune écriture perdue : chaque worker retrouve ses 50 demandes
+    poids = dict(PopularityLog(path, max_entries=100, half_life_h=0).populaires())
+    assert poids == {("passage", "fr", f"Jean {i}", ""): 50.0 for i in range(4)}
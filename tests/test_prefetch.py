@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+
+from bible_loader import BibleSnapshot, bible_loader
+from prefetch import generateur
+
+
+class Corps(BaseModel):
+    reference: str
+    niveau: str
+
+
+def test_generation_en_arriere_plan_sur_le_snapshot_de_la_requete(bibles, monkeypatch):
+    ancien, nouveau = BibleSnapshot(bibles, 1), BibleSnapshot(bibles, 2)
+    vus = []
+
+    def route(data, request):
+        vus.append((bible_loader.version, request.state.language, data.mots_deja_utilises))
+        return {"reponse_correcte": "x"}
+
+    monkeypatch.setattr(bible_loader, "_snapshot", ancien)
+    with bible_loader.pinned() as snapshot:
+        generer = generateur(route, Corps(reference="Jean 1", niveau="moyen"), "en", snapshot)
+    # Rechargement entre la réponse et le remplissage du buffer
+    monkeypatch.setattr(bible_loader, "_snapshot", nouveau)
+
+    generer({"b", "a"})
+    assert vus == [(1, "en", ["a", "b"])]
+    assert bible_loader.version == 2
+
+
+def test_questions_de_session_pre_generees(client):
+    import time
+    from prefetch import prefetch_buffer
+
+    client, _ = client
+    corps = {"reference": "Jean 1", "niveau": "moyen", "session_id": "partie-1"}
+    premiere = client.post("/qcm", json=corps).json()
+    hits = prefetch_buffer.hits
+    cle = ("partie-1", "jeu_qcm", "fr", bible_loader.version, "Jean 1", "moyen", None)
+    # Attend la fin du remplissage d'arrière-plan
+    for _ in range(100):
+        if cle in prefetch_buffer and cle not in prefetch_buffer._pending:
+            break
+        time.sleep(0.05)
+    seconde = client.post("/qcm", json={**corps, "mots_deja_utilises": [premiere["reponse_correcte"]]}).json()
+    assert prefetch_buffer.hits == hits + 1
+    assert seconde["reponse_correcte"] != premiere["reponse_correcte"]
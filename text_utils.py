@@ -0,0 +1,16 @@
+import string
+
+def normalize_text(s: str) -> str:
+    """Met en minuscule, retire les accents et la ponctuation."""
+    s = s.lower().strip()
+    replacements = (
+        ("á", "a"), ("à", "a"), ("â", "a"), ("ä", "a"),
+        ("é", "e"), ("è", "e"), ("ê", "e"), ("ë", "e"),
+        ("í", "i"), ("î", "i"), ("ï", "i"),
+        ("ó", "o"), ("ô", "o"), ("ö", "o"),
+        ("ú", "u"), ("ù", "u"), ("û", "u"), ("ü", "u"),
+        ("ç", "c"),
+    )
+    for a, b in replacements:
+        s = s.replace(a, b)
+    return s.translate(str.maketrans('', '', string.punctuation))
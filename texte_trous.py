@@ -0,0 +1,94 @@
+import re
+from typing import List, Sequence
+import numpy as np
+from bible_loader import BibleSnapshot, register_index
+
+# Nombre de mots à cacher par niveau (routes duel / batch)
+MOTS_CACHES_PAR_NIVEAU = {"facile": 2, "moyen": 4, "difficile": 6}
+TROU = "_____"
+
+
+class TokenIndex:
+    """
+    Mots de tous les versets d'une langue à plat, avec des tableaux NumPy :
+    - offsets[p]..offsets[p+1] : mots du verset p (position dans bibles[lang])
+    - eligible : mot de plus de 3 lettres (peut être caché)
+    - answers : mot nettoyé de sa ponctuation, tel qu'attendu en réponse
+    """
+
+    def __init__(self, snapshot: BibleSnapshot, lang: str):
+        self.verses = snapshot.bibles.get(lang, [])
+        words: List[str] = []
+        offsets = [0]
+        for v in self.verses:
+            words.extend(v.get("text", "").split())
+            offsets.append(len(words))
+
+        self.words = words
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lengths = np.diff(self.offsets)
+        self.eligible = np.fromiter((len(w) > 3 for w in words), dtype=bool, count=len(words))
+        cumul = np.concatenate(([0], np.cumsum(self.eligible, dtype=np.int64)))
+        self.eligible_counts = cumul[self.offsets[1:]] - cumul[self.offsets[:-1]]
+        cleaner = re.compile(r'[^\w\s-]')
+        self.answers = [cleaner.sub('', w) if e else w for w, e in zip(words, self.eligible)]
+
+    def generer_batch(self, positions: Sequence[int], nombre: int, niveau: str,
+                      rng: np.random.Generator) -> List[dict]:
+        """
+        Génère `nombre` jeux de texte à trous parmi les versets `positions` :
+        choix des versets, des mots cachés et des masques en quelques opérations
+        vectorisées, puis assemblage des chaînes.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if positions.size == 0 or nombre <= 0:
+            return []
+        positions = positions[self.eligible_counts[positions] > 0]
+        if positions.size == 0:
+            return []
+
+        # 1. Versets tirés (avec remise, comme random.choice répété)
+        choisis = positions[rng.integers(0, positions.size, size=nombre)]
+        starts = self.offsets[choisis]
+        lengths = self.lengths[choisis]
+        max_len = int(lengths.max())
+
+        # 2. Mots cachables de chaque ligne
+        cols = np.arange(max_len)
+        valid = cols[None, :] < lengths[:, None]
+        token_idx = np.where(valid, starts[:, None] + cols[None, :], 0)
+        cachable = valid & self.eligible[token_idx]
+
+        # 3. Tirage des mots cachés : clés aléatoires, les non-cachables en dernier
+        nb_cacher = np.minimum(MOTS_CACHES_PAR_NIVEAU.get(niveau.lower(), 2), lengths // 2)
+        nb_cacher = np.minimum(nb_cacher, self.eligible_counts[choisis])
+        keys = rng.random((nombre, max_len))
+        keys[~cachable] = np.inf
+        rangs = np.argsort(np.argsort(keys, axis=1), axis=1)
+        masque = rangs < nb_cacher[:, None]
+
+        # 4. Assemblage : indices cachés extraits en une fois, puis découpés par ligne
+        _, colonnes = np.nonzero(masque)
+        colonnes = colonnes.tolist()
+        bornes = np.concatenate(([0], np.cumsum(masque.sum(axis=1)))).tolist()
+        words, answers, verses = self.words, self.answers, self.verses
+
+        jeux = []
+        for ligne, (start, length, pos) in enumerate(zip(starts.tolist(), lengths.tolist(), choisis.tolist())):
+            indices = colonnes[bornes[ligne]:bornes[ligne + 1]]
+            mots = words[start:start + length]
+            reponses = [answers[start + i] for i in indices]
+            for i in indices:
+                mots[i] = TROU
+            v = verses[pos]
+            jeux.append({
+                "verset_modifie": " ".join(mots),
+                "reponses": reponses,
+                "indices": indices,
+                "reference": f"{v['book_name']} {v['chapter']}:{v['verse']}",
+                "texte_original": v["text"]
+            })
+        return jeux
+
+
+register_index("tokens", TokenIndex)
@@ -0,0 +1,84 @@
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from bible_loader import bible_loader
+from game_routes import DISTRACTOR_BACKEND, ReferenceRequest, distracteurs_ia, passage_json
+from introspection import estimate_size
+from popularity import popularity_log
+from prefetch import ROUTES, prefill
+from text_utils import normalize_text
+
+# Budget du préchauffage au démarrage : durée maximale et mémoire ajoutée aux caches
+WARMUP_BUDGET_S = float(os.environ.get("WARMUP_BUDGET_S", "20"))
+WARMUP_BUDGET_MB = float(os.environ.get("WARMUP_BUDGET_MB", "64"))
+
+# Bilan du dernier préchauffage (statistiques d'administration)
+dernier_prechauffage: Dict[str, Any] = {}
+
+
+def _contexte(mot: str, livre: str, language: str) -> str:
+    """Contexte d'une question IA : les trois mots qui précèdent le mot dans le premier verset du livre qui le contient."""
+    cible = normalize_text(mot)
+    for v in bible_loader.get_verses(language):
+        if v.get("book_name") != livre:
+            continue
+        mots = v.get("text", "").split()
+        for i, m in enumerate(mots):
+            if normalize_text(m) == cible:
+                return " ".join(mots[max(0, i - 3):i]) + " _____"
+    return "_____"
+
+
+def prechauffer_caches(budget_s: float = WARMUP_BUDGET_S, budget_mb: float = WARMUP_BUDGET_MB) -> Dict[str, Any]:
+    """
+    Remplit les caches à partir du fichier de popularité, de l'entrée la plus demandée
+    à la moins demandée : passages, réserve partagée de questions (/jeu, /qcm) et
+    distracteurs de l'IA distante. S'arrête dès que le budget de temps ou de mémoire
+    est atteint ; les caches continuent ensuite à se remplir normalement.
+    """
+    start = time.perf_counter()
+    budget_octets = budget_mb * 1024 * 1024
+    seen: set = set()
+    octets = 0
+    compte: Counter = Counter()
+    arret: Optional[str] = None
+
+    for (route, langue, cle, parametre), _ in popularity_log.populaires():
+        if time.perf_counter() - start >= budget_s:
+            arret = "temps"
+            break
+        if octets >= budget_octets:
+            arret = "memoire"
+            break
+
+        try:
+            if route == "passage":
+                # Les chapitres entiers sont déjà pré-calculés dans le snapshot
+                if bible_loader.get_chapter_payloads(cle, langue) is not None:
+                    continue
+                ajout = passage_json(cle, langue)
+            elif route in ROUTES:
+                ajout = prefill(route, ReferenceRequest(reference=cle, niveau=parametre), langue)
+            elif route == "distracteurs" and DISTRACTOR_BACKEND != "local":
+                ajout = distracteurs_ia(_contexte(cle, parametre, langue), cle, parametre, langue)
+            else:
+                continue
+        except Exception as e:
+            print(f"⚠️  Préchauffage de {route} '{cle}' échoué: {e}")
+            continue
+
+        if ajout:
+            octets += estimate_size(ajout, seen)
+            compte[route] += 1
+
+    dernier_prechauffage.clear()
+    dernier_prechauffage.update({
+        "entrees": dict(compte),
+        "octets": octets,
+        "duree_ms": round((time.perf_counter() - start) * 1000, 1),
+        "arret": arret
+    })
+    print(f"🔥 Caches préchauffés en {time.perf_counter() - start:.2f}s : "
+          f"{sum(compte.values())} entrées, {octets / 1024:.0f} Ko" + (f" (budget {arret} atteint)" if arret else ""))
+    return dict(dernier_prechauffage)